@@ -12,7 +12,7 @@ from .config import get_settings
 from .dependencies import limiter
 from .exceptions import YouTubeAPIError
 from .routers import ai_router, health_router, prompts_router, storage_router, video_router
-from .services.cache import get_cache
+from .services.cache import close_cache, get_cache
 from .services.transcript import get_proxy_config
 from .services.youtube import close_http_client
 from .utils.logging import setup_logging
@@ -33,7 +33,8 @@ async def lifespan(app: FastAPI):
     logger.info("youtube_api_server_starting")
     logger.info("=" * 40)
 
-    # Initialize services
+    # Initialize services (connection pools are created once and shared by all requests;
+    # handlers and the @cached decorator all reach the cache through get_cache())
     cache = get_cache()
     proxy_config = get_proxy_config()
 
@@ -74,6 +75,7 @@ async def lifespan(app: FastAPI):
     logger.info("=" * 40)
     logger.info("youtube_api_server_shutting_down")
     await close_http_client()
+    close_cache()
     logger.info("=" * 40)
 
 
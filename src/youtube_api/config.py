@@ -23,6 +23,8 @@ class Settings(BaseSettings):
     # Redis configuration
     redis_url: Optional[str] = None
     cache_ttl_seconds: int = 3600
+    # Store persistent transcripts zstd-compressed (requires the zstandard package)
+    storage_compression: bool = False
 
     # Webshare proxy configuration
     webshare_proxy_username: Optional[str] = None
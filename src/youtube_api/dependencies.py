@@ -11,8 +11,13 @@ from .config import Settings, get_settings
 from .services.ai import get_openrouter_client
 from .services.cache import RedisCache, get_cache
 
-# Rate limiter instance
-limiter = Limiter(key_func=get_remote_address)
+# Rate limiter instance (Redis-backed when configured so all workers share counters)
+_settings = get_settings()
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=_settings.redis_url if _settings.has_redis_config else None,
+    in_memory_fallback_enabled=True,
+)
 
 
 def get_settings_dep() -> Settings:
@@ -21,7 +26,7 @@ def get_settings_dep() -> Settings:
 
 
 def get_cache_dep() -> RedisCache:
-    """Dependency for getting cache instance."""
+    """Dependency for getting the cache instance created during app startup."""
     return get_cache()
 
 
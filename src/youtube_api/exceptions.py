@@ -45,6 +45,14 @@ class TranscriptNotFoundError(YouTubeAPIError):
         super().__init__(message, status.HTTP_404_NOT_FOUND)
 
 
+class VideoRestrictedError(YouTubeAPIError):
+    """Video cannot be accessed without signing in (e.g. age-restricted)."""
+
+    def __init__(self, video_id: str = None):
+        message = f"Video is restricted: {video_id}" if video_id else "Video is restricted"
+        super().__init__(message, status.HTTP_403_FORBIDDEN)
+
+
 class RateLimitError(YouTubeAPIError):
     """Rate limited by YouTube or API."""
 
@@ -52,6 +60,17 @@ class RateLimitError(YouTubeAPIError):
         super().__init__(message, status.HTTP_429_TOO_MANY_REQUESTS)
 
 
+class UpstreamServiceError(YouTubeAPIError):
+    """YouTube failed transiently (timeout, 5xx, rate limit or IP block)."""
+
+    def __init__(
+        self,
+        message: str = "YouTube is temporarily unavailable. Please try again later.",
+        status_code: int = status.HTTP_502_BAD_GATEWAY,
+    ):
+        super().__init__(message, status_code)
+
+
 class AIServiceUnavailableError(YouTubeAPIError):
     """AI service (OpenRouter) is not configured or unavailable."""
 
@@ -14,7 +14,7 @@ from ..models.requests import OpenRouterProxyRequest, VideoNotesRequest, VideoPa
 from ..models.responses import NotesResponse, OpenRouterProxyResponse, PatternProcessingResponse, TranslationResponse
 from ..services.ai import AIService
 from ..services.transcript import TranscriptService
-from ..services.youtube import YouTubeService
+from ..services.youtube import YouTubeService, get_http_client
 from ..utils.prompt_service import get_prompt_service
 
 logger = structlog.get_logger(__name__)
@@ -155,24 +155,26 @@ async def openrouter_proxy(
 
         model = body.model or "xiaomi/mimo-v2-flash:free"
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {settings.openrouter_api_key}",
-                },
-                json={
-                    "model": model,
-                    "messages": [{"role": "user", "content": body.prompt}],
-                    "max_tokens": body.max_tokens,
-                },
-            )
+        client = await get_http_client()
+        response = await client.post(
+            "https://openrouter.ai/api/v1/chat/completions",
+            headers={
+                "Content-Type": "application/json",
+                "Authorization": f"Bearer {settings.openrouter_api_key}",
+            },
+            json={
+                "model": model,
+                "messages": [{"role": "user", "content": body.prompt}],
+                "max_tokens": body.max_tokens,
+            },
+            # Completions take longer than the shared client's default timeout
+            timeout=30.0,
+        )
 
-            response.raise_for_status()
-            data = response.json()
+        response.raise_for_status()
+        data = response.json()
 
-            return {"response": data}
+        return {"response": data}
 
     except httpx.HTTPStatusError as e:
         logger.error("openrouter_http_error", status=e.response.status_code, detail=str(e))
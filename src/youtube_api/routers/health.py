@@ -1,5 +1,6 @@
 """Health and cache management endpoints."""
 
+import asyncio
 from datetime import datetime
 from typing import Dict
 
@@ -56,12 +57,20 @@ async def health_check(
     """Health check endpoint to verify server and service status."""
     logger.info("health_check")
 
+    # Redis connects lazily, so report whether it is actually reachable
+    if not cache.enabled:
+        cache_status = "redis_disabled"
+    elif await asyncio.to_thread(cache.ping):
+        cache_status = "redis_enabled"
+    else:
+        cache_status = "redis_unavailable"
+
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "proxy_status": f"webshare_{'enabled' if settings.has_proxy_config else 'disabled'}",
         "proxy_username": settings.webshare_proxy_username if settings.has_proxy_config else None,
-        "cache_status": f"redis_{'enabled' if cache.enabled else 'disabled'}",
+        "cache_status": cache_status,
         "cache_ttl_seconds": cache.cache_ttl if cache.enabled else None,
         "parallel_processing": "enabled",
     }
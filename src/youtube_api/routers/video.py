@@ -28,7 +28,7 @@ async def get_video_data(request: Request, body: YouTubeRequest) -> Dict:
     Get video metadata from YouTube.
 
     Returns title, author, thumbnail, and other oEmbed data.
-    Results are cached for 1 hour.
+    Results are cached for 7 days.
     """
     logger.info("video_data_request", url=body.url)
 
@@ -45,7 +45,7 @@ async def get_video_captions(request: Request, body: YouTubeRequest) -> Dict:
     """
     Get video captions/transcript as plain text.
 
-    Supports language preferences. Results are cached for 1 hour.
+    Supports language preferences. Results are cached for 30 days.
     """
     logger.info("video_captions_request", url=body.url, languages=body.languages)
 
@@ -63,7 +63,7 @@ async def get_video_timestamps(request: Request, body: YouTubeRequest) -> Dict:
     Get timestamped transcript segments.
 
     Returns list of "MM:SS - text" formatted segments.
-    Results are cached for 1 hour.
+    Results are cached for 30 days.
     """
     logger.info("video_timestamps_request", url=body.url, languages=body.languages)
 
@@ -81,7 +81,7 @@ async def get_video_transcript_languages(request: Request, body: YouTubeRequest)
     List available transcript languages for a video.
 
     Returns language codes, names, and whether they're auto-generated.
-    Results are cached for 1 hour.
+    Results are cached for 24 hours.
     """
     logger.info("video_languages_request", url=body.url)
 
@@ -1,6 +1,7 @@
 """AI service for video notes and translation using OpenRouter."""
 
-from typing import List, Literal, Optional
+from functools import lru_cache
+from typing import List, Literal, Optional, Tuple
 
 import structlog
 from openai import OpenAI
@@ -40,18 +41,24 @@ def get_openrouter_client() -> Optional[OpenAI]:
     return _openrouter_client
 
 
+@lru_cache(maxsize=128)
+def _split_pattern(pattern_content: str) -> Tuple[str, str]:
+    """
+    Split a Fabric-style pattern at its INPUT: placeholder.
+
+    Returns:
+        Tuple of (instructions, suffix) where suffix is any text after INPUT:
+    """
+    instructions, _, suffix = pattern_content.partition("INPUT:")
+    return instructions.rstrip(), suffix
+
+
 class AIService:
     """Service for AI-powered video analysis using OpenRouter."""
 
-    # Notes format prompts
+    # Notes format system prompts (video content is sent separately as the user message)
     NOTES_PROMPTS = {
-        "summary": """Create a concise summary of this YouTube video.
-
-Video Title: {title}
-Channel: {author}
-
-Transcript:
-{transcript}
+        "summary": """Create a concise summary of the YouTube video transcript provided by the user.
 
 Provide:
 1. A 2-3 sentence executive summary
@@ -59,13 +66,7 @@ Provide:
 3. Main topics covered
 
 Format the response in clean markdown.""",
-        "detailed": """Create detailed notes from this YouTube video transcript.
-
-Video Title: {title}
-Channel: {author}
-
-Transcript:
-{transcript}
+        "detailed": """Create detailed notes from the YouTube video transcript provided by the user.
 
 Provide:
 1. Executive Summary (3-4 sentences)
@@ -75,13 +76,7 @@ Provide:
 5. Action items or recommendations (if applicable)
 
 Format the response in clean markdown with proper headings.""",
-        "structured": """Convert this YouTube video transcript into well-structured notes.
-
-Video Title: {title}
-Channel: {author}
-
-Transcript:
-{transcript}
+        "structured": """Convert the YouTube video transcript provided by the user into well-structured notes.
 
 Create structured notes with:
 1. Overview: Brief description of video content
@@ -92,13 +87,7 @@ Create structured notes with:
 Format the response in clean markdown with proper headings and bullet points.""",
     }
 
-    TRANSLATION_PROMPT = """Translate this YouTube video transcript to {target_language}.
-
-Video Title: {title}
-Channel: {author}
-
-Original Transcript:
-{transcript}
+    TRANSLATION_PROMPT = """Translate the YouTube video transcript provided by the user to {target_language}.
 
 Requirements:
 1. Translate the entire transcript naturally and accurately
@@ -109,18 +98,13 @@ Requirements:
 
 Provide ONLY the translated transcript, nothing else."""
 
-    TIMESTAMP_TRANSLATION_PROMPT = """Translate these video timestamps to {target_language}.
-
-Original Timestamps:
-{timestamps}
+    TIMESTAMP_TRANSLATION_PROMPT = """Translate the video timestamps provided by the user to {target_language}.
 
 Requirements:
 1. Keep the timestamp format (MM:SS - text)
 2. Only translate the text part, not the timestamps
 3. Maintain natural speech patterns
-4. Provide ONLY the translated timestamps, one per line
-
-Translated timestamps:"""
+4. Provide ONLY the translated timestamps, one per line"""
 
     @staticmethod
     def _ensure_client() -> OpenAI:
@@ -130,6 +114,11 @@ Translated timestamps:"""
             raise AIServiceUnavailableError()
         return client
 
+    @staticmethod
+    def _video_message(title: str, author: str, transcript: str) -> str:
+        """Build the user message carrying the video context and transcript."""
+        return f"Video Title: {title}\nChannel: {author}\n\nTranscript:\n{transcript}"
+
     @staticmethod
     async def generate_notes(
         title: str,
@@ -156,24 +145,22 @@ Translated timestamps:"""
 
         client = AIService._ensure_client()
 
-        prompt_template = AIService.NOTES_PROMPTS.get(format, AIService.NOTES_PROMPTS["structured"])
-        prompt = prompt_template.format(
-            title=title,
-            author=author,
-            transcript=transcript,
-        )
+        system_prompt = AIService.NOTES_PROMPTS.get(format, AIService.NOTES_PROMPTS["structured"])
 
         try:
             response = client.chat.completions.create(
                 model="xiaomi/mimo-v2-flash:free",
                 max_tokens=4000,
-                messages=[{"role": "user", "content": prompt}],
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": AIService._video_message(title, author, transcript)},
+                ],
             )
 
             notes = response.choices[0].message.content
             if not notes:
                 raise AIServiceUnavailableError("Failed to generate notes from AI service")
-            logger.info("notes_generated", char_count=len(notes), word_count=len(notes.split()))
+            logger.info("notes_generated", char_count=len(notes))
             return notes
         except Exception as e:
             logger.error("notes_generation_failed", error=str(e), error_type=type(e).__name__)
@@ -208,18 +195,16 @@ Translated timestamps:"""
         client = AIService._ensure_client()
 
         # Translate main transcript
-        prompt = AIService.TRANSLATION_PROMPT.format(
-            target_language=target_language,
-            title=title,
-            author=author,
-            transcript=transcript,
-        )
+        system_prompt = AIService.TRANSLATION_PROMPT.format(target_language=target_language)
 
         try:
             response = client.chat.completions.create(
                 model="xiaomi/mimo-v2-flash:free",
                 max_tokens=8000,
-                messages=[{"role": "user", "content": prompt}],
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": AIService._video_message(title, author, transcript)},
+                ],
             )
 
             translated_text = response.choices[0].message.content
@@ -238,14 +223,16 @@ Translated timestamps:"""
 
             timestamp_prompt = AIService.TIMESTAMP_TRANSLATION_PROMPT.format(
                 target_language=target_language,
-                timestamps=timestamps_text,
             )
 
             try:
                 timestamp_response = client.chat.completions.create(
                     model="xiaomi/mimo-v2-flash:free",
                     max_tokens=2000,
-                    messages=[{"role": "user", "content": timestamp_prompt}],
+                    messages=[
+                        {"role": "system", "content": timestamp_prompt},
+                        {"role": "user", "content": timestamps_text},
+                    ],
                 )
 
                 timestamp_content = timestamp_response.choices[0].message.content
@@ -290,26 +277,27 @@ Translated timestamps:"""
 
         client = AIService._ensure_client()
 
-        # Fabric patterns expect INPUT: at the end where we insert the transcript
-        # Add context about the video
-        context = f"Video Title: {title}\nChannel: {author}\n\n"
-        full_input = context + transcript
-
-        # Replace the INPUT: placeholder with the actual transcript
-        prompt = pattern_content.replace("INPUT:", full_input)
+        # Fabric patterns expect INPUT: at the end where we insert the transcript.
+        # The instructions go in the system message so the pattern is never copied
+        # together with the transcript into one large prompt string.
+        instructions, suffix = _split_pattern(pattern_content)
+        user_content = f"Video Title: {title}\nChannel: {author}\n\n{transcript}{suffix}"
 
         try:
             response = client.chat.completions.create(
                 model="xiaomi/mimo-v2-flash:free",
                 max_tokens=4000,
-                messages=[{"role": "user", "content": prompt}],
+                messages=[
+                    {"role": "system", "content": instructions},
+                    {"role": "user", "content": user_content},
+                ],
             )
 
             result = response.choices[0].message.content
             if not result:
                 raise AIServiceUnavailableError("Failed to process pattern from AI service")
 
-            logger.info("pattern_processed", char_count=len(result), word_count=len(result.split()))
+            logger.info("pattern_processed", char_count=len(result))
             return result
         except Exception as e:
             logger.error("pattern_processing_failed", error=str(e), error_type=type(e).__name__)
@@ -1,22 +1,40 @@
 """Redis caching service for YouTube API responses."""
 
+import asyncio
 import hashlib
 import inspect
 import json
+import time
 from functools import wraps
-from typing import Any, Callable, Optional
+from itertools import chain
+from typing import Any, Callable, Dict, Optional, Tuple, Type
 
 import redis
 import structlog
 
 from ..config import get_settings
+from ..exceptions import YouTubeAPIError
 
 logger = structlog.get_logger(__name__)
 
+# Seconds to skip Redis after a failed operation before trying it again
+HEALTH_CHECK_INTERVAL = 30
+
+# Cache calls run on the event loop, so keep the connect timeout short: a retry
+# against a down Redis (at most once per HEALTH_CHECK_INTERVAL) blocks it this long
+SOCKET_CONNECT_TIMEOUT = 1
+
 
 class RedisCache:
     """Redis-based caching layer for YouTube API responses."""
 
+    # Sorted set of cache keys scored by expiry time, used to clear without KEYS
+    INDEX_KEY = "youtube_api_index"
+    # Set once keys written before the index existed have been swept with SCAN
+    INDEX_MIGRATED_KEY = "youtube_api_index_migrated"
+    # Keys requested per SCAN page when sweeping unindexed keys
+    SCAN_COUNT = 500
+
     def __init__(self, redis_url: Optional[str] = None, cache_ttl: int = 3600):
         """
         Initialize Redis connection.
@@ -30,20 +48,27 @@ class RedisCache:
         self.cache_ttl = cache_ttl or settings.cache_ttl_seconds
         self.enabled = bool(self.redis_url)
         self.client: Optional[redis.Redis] = None
+        # Bytes-returning client for binary values, created on first use
+        self._raw_client: Optional[redis.Redis] = None
+        # In-flight computations keyed by cache key, used to coalesce concurrent misses
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Lazy health state: None until the first operation, False after a failure
+        self._healthy: Optional[bool] = None
+        self._last_check: float = 0.0
 
         if self.enabled:
             try:
+                # No PING here: the pool connects on first use and
+                # health_check_interval detects dead connections transparently
                 self.client = redis.from_url(
                     self.redis_url,
                     decode_responses=True,
-                    socket_connect_timeout=5,
+                    socket_connect_timeout=SOCKET_CONNECT_TIMEOUT,
                     socket_keepalive=True,
-                    health_check_interval=30,
+                    health_check_interval=HEALTH_CHECK_INTERVAL,
                 )
-                # Test connection
-                self.client.ping()
                 logger.info(
-                    "redis_connected",
+                    "redis_configured",
                     ttl_seconds=self.cache_ttl,
                 )
             except Exception as e:
@@ -53,21 +78,74 @@ class RedisCache:
         else:
             logger.info("redis_disabled", reason="REDIS_URL not set")
 
+    @property
+    def raw_client(self) -> Optional[redis.Redis]:
+        """Redis client without response decoding, for binary values (e.g. compressed data)."""
+        if self._raw_client is None and self.client is not None:
+            self._raw_client = redis.from_url(
+                self.redis_url,
+                socket_connect_timeout=SOCKET_CONNECT_TIMEOUT,
+                socket_keepalive=True,
+                health_check_interval=HEALTH_CHECK_INTERVAL,
+            )
+        return self._raw_client
+
     def _generate_key(self, prefix: str, *args, **kwargs) -> str:
         """Generate a cache key from function arguments."""
-        key_parts = [str(arg) for arg in args]
-        key_parts.extend([f"{k}={v}" for k, v in sorted(kwargs.items())])
-        key_string = ":".join(key_parts)
-        key_hash = hashlib.md5(key_string.encode()).hexdigest()
-        return f"youtube_api:{prefix}:{key_hash}"
+        # Feed each part to the digest incrementally instead of building one joined
+        # string, so large arguments (e.g. transcripts) are not copied an extra time.
+        # The digest is identical to hashing ":".join(parts).
+        key_parts = chain(
+            (str(arg) for arg in args),
+            (f"{k}={v}" for k, v in sorted(kwargs.items())),
+        )
+        key_hash = hashlib.md5()
+        for i, part in enumerate(key_parts):
+            if i:
+                key_hash.update(b":")
+            key_hash.update(part.encode())
+        return f"youtube_api:{prefix}:{key_hash.hexdigest()}"
+
+    def is_available(self) -> bool:
+        """Check if Redis should be used, skipping it for a while after a failure."""
+        if not self.enabled or not self.client:
+            return False
+        if self._healthy is False:
+            return time.monotonic() - self._last_check >= HEALTH_CHECK_INTERVAL
+        return True
+
+    def mark_healthy(self, healthy: bool) -> None:
+        """Record the outcome of the latest Redis operation."""
+        if healthy != self._healthy:
+            if healthy:
+                logger.info("redis_connected", ttl_seconds=self.cache_ttl)
+            else:
+                logger.warning("redis_unavailable", retry_in_seconds=HEALTH_CHECK_INTERVAL)
+        self._healthy = healthy
+        self._last_check = time.monotonic()
+
+    def ping(self) -> bool:
+        """Check Redis is reachable, without retrying during the failure backoff."""
+        if not self.is_available():
+            return False
+
+        try:
+            self.client.ping()
+            self.mark_healthy(True)
+            return True
+        except Exception as e:
+            logger.error("cache_ping_error", error=str(e))
+            self.mark_healthy(False)
+            return False
 
     def get(self, key: str) -> Optional[Any]:
         """Get a value from cache."""
-        if not self.enabled or not self.client:
+        if not self.is_available():
             return None
 
         try:
             value = self.client.get(key)
+            self.mark_healthy(True)
             if value:
                 logger.debug("cache_hit", key=key)
                 return json.loads(value)
@@ -75,34 +153,48 @@ class RedisCache:
             return None
         except Exception as e:
             logger.error("cache_get_error", key=key, error=str(e))
+            self.mark_healthy(False)
             return None
 
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
         """Set a value in cache with TTL."""
-        if not self.enabled or not self.client:
+        if not self.is_available():
             return False
 
         try:
             ttl = ttl or self.cache_ttl
             serialized = json.dumps(value)
-            self.client.setex(key, ttl, serialized)
+            now = time.time()
+            # Write value and index entry in one round-trip, pruning expired index members
+            pipe = self.client.pipeline()
+            pipe.setex(key, ttl, serialized)
+            pipe.zadd(self.INDEX_KEY, {key: now + ttl})
+            pipe.zremrangebyscore(self.INDEX_KEY, "-inf", now)
+            pipe.execute()
+            self.mark_healthy(True)
             logger.debug("cache_set", key=key, ttl=ttl)
             return True
         except Exception as e:
             logger.error("cache_set_error", key=key, error=str(e))
+            self.mark_healthy(False)
             return False
 
     def delete(self, key: str) -> bool:
         """Delete a key from cache."""
-        if not self.enabled or not self.client:
+        if not self.is_available():
             return False
 
         try:
-            self.client.delete(key)
+            pipe = self.client.pipeline()
+            pipe.delete(key)
+            pipe.zrem(self.INDEX_KEY, key)
+            pipe.execute()
+            self.mark_healthy(True)
             logger.debug("cache_delete", key=key)
             return True
         except Exception as e:
             logger.error("cache_delete_error", key=key, error=str(e))
+            self.mark_healthy(False)
             return False
 
     def clear_all(self) -> bool:
@@ -111,25 +203,49 @@ class RedisCache:
             return False
 
         try:
-            pattern = "youtube_api:*"
-            keys = self.client.keys(pattern)
-            if keys:
-                self.client.delete(*keys)
-                logger.info("cache_cleared", keys_deleted=len(keys))
+            keys = self.client.zrange(self.INDEX_KEY, 0, -1)
+            pipe = self.client.pipeline(transaction=False)
+            for i in range(0, len(keys), 500):
+                pipe.unlink(*keys[i:i + 500])
+            pipe.unlink(self.INDEX_KEY)
+            pipe.execute()
+            deleted = len(keys) + self._clear_unindexed()
+            if deleted:
+                logger.info("cache_cleared", keys_deleted=deleted)
             return True
         except Exception as e:
             logger.error("cache_clear_error", error=str(e))
             return False
 
+    def _clear_unindexed(self) -> int:
+        """Delete keys written before the index existed; runs once per Redis database."""
+        if not self.client.set(self.INDEX_MIGRATED_KEY, 1, nx=True):
+            return 0
+
+        deleted = 0
+        batch = []
+        for key in self.client.scan_iter(match="youtube_api:*", count=self.SCAN_COUNT):
+            batch.append(key)
+            if len(batch) >= self.SCAN_COUNT:
+                deleted += self.client.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += self.client.unlink(*batch)
+        logger.info("cache_index_migrated", keys_deleted=deleted)
+        return deleted
+
     def get_stats(self) -> dict:
         """Get cache statistics."""
         if not self.enabled or not self.client:
             return {"enabled": False, "status": "disabled"}
 
         try:
-            info = self.client.info("stats")
-            pattern = "youtube_api:*"
-            key_count = len(self.client.keys(pattern))
+            # Count live keys from the index instead of a blocking KEYS scan
+            pipe = self.client.pipeline(transaction=False)
+            pipe.zremrangebyscore(self.INDEX_KEY, "-inf", time.time())
+            pipe.zcard(self.INDEX_KEY)
+            pipe.info("stats")
+            _, key_count, info = pipe.execute()
 
             return {
                 "enabled": True,
@@ -155,16 +271,75 @@ def get_cache() -> RedisCache:
     return _cache_instance
 
 
-def cached(prefix: str, ttl: Optional[int] = None):
+def close_cache() -> None:
+    """Close the global cache connection pool (for cleanup)."""
+    global _cache_instance
+    if _cache_instance is not None:
+        if _cache_instance.client is not None:
+            _cache_instance.client.close()
+            logger.info("redis_connection_closed")
+        if _cache_instance._raw_client is not None:
+            _cache_instance._raw_client.close()
+        _cache_instance = None
+
+
+# Result handed to coalesced waiters when the caller computing the value is cancelled
+_LEADER_CANCELLED = object()
+
+# Marker key identifying a cached failure (negative cache entry)
+NEGATIVE_CACHE_MARKER = "__error__"
+
+
+def _negative_entry(error: YouTubeAPIError) -> dict:
+    """Build the cache entry stored in place of a result when a call fails."""
+    return {
+        NEGATIVE_CACHE_MARKER: type(error).__name__,
+        "message": error.message,
+        "status_code": error.status_code,
+    }
+
+
+def _should_negative_cache(
+    error: Exception, error_types: Tuple[Type[YouTubeAPIError], ...]
+) -> bool:
+    """Only cache real absences (404s); transient upstream failures must be retried."""
+    return bool(error_types) and isinstance(error, error_types) and error.status_code == 404
+
+
+def _raise_if_negative(
+    cached_value: Any, error_types: Tuple[Type[YouTubeAPIError], ...]
+) -> None:
+    """Re-raise the original error if a cached value is a negative cache entry."""
+    if not error_types or not isinstance(cached_value, dict):
+        return
+    error_name = cached_value.get(NEGATIVE_CACHE_MARKER)
+    if error_name is None:
+        return
+    for error_type in error_types:
+        if error_type.__name__ == error_name:
+            # Rebuild without calling the subclass __init__, whose arguments vary
+            error = error_type.__new__(error_type)
+            YouTubeAPIError.__init__(error, cached_value["message"], cached_value["status_code"])
+            raise error
+
+
+def cached(
+    prefix: str,
+    ttl: Optional[int] = None,
+    negative_cache: Tuple[Type[YouTubeAPIError], ...] = (),
+    negative_ttl: int = 300,
+):
     """
     Decorator to cache function results in Redis.
 
     Args:
         prefix: Cache key prefix (e.g., 'video_data', 'captions')
         ttl: Time to live in seconds (defaults to CACHE_TTL_SECONDS)
+        negative_cache: Exception types whose 404 failures are cached and re-raised on hit
+        negative_ttl: Time to live in seconds for cached failures
 
     Example:
-        @cached(prefix='video_data', ttl=3600)
+        @cached(prefix='video_data', ttl=3600, negative_cache=(VideoNotFoundError,))
         def get_video_data(url: str) -> dict:
             return data
     """
@@ -175,11 +350,39 @@ def cached(prefix: str, ttl: Optional[int] = None):
             cache = get_cache()
             cache_key = cache._generate_key(prefix, *args, **kwargs)
 
-            cached_value = cache.get(cache_key)
-            if cached_value is not None:
-                return cached_value
-
-            result = await func(*args, **kwargs)
+            while True:
+                cached_value = cache.get(cache_key)
+                if cached_value is not None:
+                    _raise_if_negative(cached_value, negative_cache)
+                    return cached_value
+
+                # Coalesce concurrent misses: later callers await the first caller's work
+                inflight = cache._inflight.get(cache_key)
+                if inflight is None:
+                    break
+                result = await asyncio.shield(inflight)
+                if result is not _LEADER_CANCELLED:
+                    return result
+                # The leader was cancelled: retry, leading the computation if no one else is
+
+            future = asyncio.get_running_loop().create_future()
+            cache._inflight[cache_key] = future
+            try:
+                result = await func(*args, **kwargs)
+            except asyncio.CancelledError:
+                # Wake waiters with a sentinel so they retry rather than inherit the cancellation
+                future.set_result(_LEADER_CANCELLED)
+                raise
+            except Exception as e:
+                future.set_exception(e)
+                future.exception()  # Mark retrieved so unawaited failures aren't logged
+                if _should_negative_cache(e, negative_cache):
+                    cache.set(cache_key, _negative_entry(e), negative_ttl)
+                raise
+            finally:
+                cache._inflight.pop(cache_key, None)
+
+            future.set_result(result)
             cache.set(cache_key, result, ttl)
             return result
 
@@ -190,9 +393,15 @@ def cached(prefix: str, ttl: Optional[int] = None):
 
             cached_value = cache.get(cache_key)
             if cached_value is not None:
+                _raise_if_negative(cached_value, negative_cache)
                 return cached_value
 
-            result = func(*args, **kwargs)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if _should_negative_cache(e, negative_cache):
+                    cache.set(cache_key, _negative_entry(e), negative_ttl)
+                raise
             cache.set(cache_key, result, ttl)
             return result
 
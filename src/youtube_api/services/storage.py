@@ -1,28 +1,92 @@
 """Persistent transcript storage service."""
 
-import json
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
+import msgspec
+import redis
 import structlog
 
 from ..config import get_settings
 from ..services.cache import get_cache
 from ..utils.url_parser import get_youtube_video_id
 
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - only needed when storage_compression is on
+    zstandard = None
+
 logger = structlog.get_logger(__name__)
 
+# Reusable metadata codecs. JSON (not msgpack) keeps values readable through the
+# shared decode_responses=True Redis client and compatible with existing entries.
+_metadata_encoder = msgspec.json.Encoder()
+_metadata_decoder = msgspec.json.Decoder(dict)
+
+# Every zstd frame starts with this magic number; plain UTF-8 text never does
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+_compressor = zstandard.ZstdCompressor(level=3) if zstandard else None
+_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+
+def _decode_transcript(value: bytes) -> str:
+    """Decode a stored transcript, decompressing it if it was saved as a zstd frame."""
+    if value.startswith(ZSTD_MAGIC):
+        if _decompressor is None:
+            raise RuntimeError("zstandard is required to read compressed transcripts")
+        value = _decompressor.decompress(value)
+    return value.decode("utf-8")
+
+
+# Metadata timestamps are stored as compact epoch seconds
+_TIMESTAMP_FIELDS = ("created_at", "last_updated")
+
+
+def _format_timestamps(metadata: Dict) -> Dict:
+    """Convert stored epoch-second timestamps to ISO strings for API responses."""
+    for field in _TIMESTAMP_FIELDS:
+        value = metadata.get(field)
+        # Entries written before the switch already hold ISO strings
+        if isinstance(value, int):
+            metadata[field] = datetime.fromtimestamp(value).isoformat()
+    return metadata
+
 
 class TranscriptStorage:
     """Service for persistent transcript storage."""
 
     STORAGE_PREFIX = "transcript_storage"
     METADATA_PREFIX = "transcript_metadata"
+    # Keys requested per SCAN page; larger pages mean fewer round-trips
+    SCAN_COUNT = 500
+    # Stats only count keys, so scan in larger pages
+    STATS_SCAN_COUNT = 1000
+    # In-process read-through cache for metadata (entries, seconds)
+    METADATA_CACHE_SIZE = 1024
+    METADATA_CACHE_TTL = 60
 
     def __init__(self):
         """Initialize transcript storage."""
         self.cache = get_cache()
         self.enabled = self.cache.enabled
+        self.compress = get_settings().storage_compression
+        if self.compress and zstandard is None:
+            logger.warning("storage_compression_unavailable", reason="zstandard not installed")
+            self.compress = False
+        # video_id -> (expires_at, encoded metadata); decoded per read so callers get a fresh dict
+        self._metadata_cache: "OrderedDict[str, Tuple[float, Union[str, bytes]]]" = OrderedDict()
+
+    def is_available(self) -> bool:
+        """Check if storage should be used, sharing the cache's Redis failure backoff."""
+        return self.enabled and self.cache.is_available()
+
+    def _mark_failure(self, error: Exception) -> None:
+        """Start the shared backoff when an operation could not reach Redis."""
+        if isinstance(error, (redis.ConnectionError, redis.TimeoutError)):
+            self.cache.mark_healthy(False)
 
     def _get_storage_key(self, video_id: str, language: Optional[str] = None) -> str:
         """Generate storage key for transcript."""
@@ -34,6 +98,30 @@ class TranscriptStorage:
         """Generate metadata key for video."""
         return f"{self.METADATA_PREFIX}:{video_id}"
 
+    def _scan(self, pattern: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Collect keys matching a pattern with non-blocking SCAN instead of KEYS.
+
+        Args:
+            pattern: Redis glob pattern
+            limit: Stop after this many keys (optional)
+
+        Returns:
+            List of matching keys
+        """
+        keys = []
+        for key in self.cache.client.scan_iter(match=pattern, count=self.SCAN_COUNT):
+            keys.append(key)
+            if limit and len(keys) >= limit:
+                break
+        return keys
+
+    def _count(self, pattern: str) -> int:
+        """Count keys matching a pattern without materializing them in a list."""
+        return sum(
+            1 for _ in self.cache.client.scan_iter(match=pattern, count=self.STATS_SCAN_COUNT)
+        )
+
     def save_transcript(
         self,
         video_id: str,
@@ -53,43 +141,59 @@ class TranscriptStorage:
         Returns:
             True if saved successfully, False otherwise
         """
-        if not self.enabled:
+        if not self.is_available():
             logger.warning("storage_disabled", reason="Redis not available")
             return False
 
         try:
-            # Save transcript (no TTL = permanent storage)
+            # Save transcript and metadata (no TTL = permanent storage)
             # Use setex with a very long TTL (10 years) to simulate permanent storage
             storage_key = self._get_storage_key(video_id, language)
-            self.cache.client.setex(storage_key, 315360000, transcript)  # 10 years
-            logger.info("transcript_saved", video_id=video_id, language=language)
-
-            # Update metadata
             metadata_key = self._get_metadata_key(video_id)
-            existing_metadata = self.get_metadata(video_id) or {}
-            
-            # Update or create metadata
-            if language:
-                if "languages" not in existing_metadata:
-                    existing_metadata["languages"] = []
-                if language not in existing_metadata["languages"]:
-                    existing_metadata["languages"].append(language)
-
-            # Merge provided metadata
-            if metadata:
-                existing_metadata.update(metadata)
-
-            # Add/update timestamp
-            existing_metadata["last_updated"] = datetime.now().isoformat()
-            if "created_at" not in existing_metadata:
-                existing_metadata["created_at"] = datetime.now().isoformat()
-
-            # Save metadata (no TTL - use 10 years)
-            self.cache.client.setex(metadata_key, 315360000, json.dumps(existing_metadata))
-            logger.info("metadata_updated", video_id=video_id)
+            value = transcript.encode("utf-8")
+            if self.compress:
+                value = _compressor.compress(value)
+
+            def write(pipe) -> bytes:
+                # Read metadata fresh under WATCH rather than from the in-process
+                # cache, so saves from other workers aren't overwritten with a stale copy
+                stored = pipe.get(metadata_key)
+                existing_metadata = _metadata_decoder.decode(stored) if stored else {}
+
+                # Update or create metadata
+                if language:
+                    if "languages" not in existing_metadata:
+                        existing_metadata["languages"] = []
+                    if language not in existing_metadata["languages"]:
+                        existing_metadata["languages"].append(language)
+
+                # Merge provided metadata
+                if metadata:
+                    existing_metadata.update(metadata)
+
+                # Add/update timestamp
+                now = int(time.time())
+                existing_metadata["last_updated"] = now
+                if "created_at" not in existing_metadata:
+                    existing_metadata["created_at"] = now
+
+                metadata_json = _metadata_encoder.encode(existing_metadata)
+                pipe.multi()
+                pipe.setex(storage_key, 315360000, value)  # 10 years
+                pipe.setex(metadata_key, 315360000, metadata_json)
+                return metadata_json
+
+            # Retried if another writer changes the metadata between read and write
+            metadata_json = self.cache.raw_client.transaction(
+                write, metadata_key, value_from_callable=True
+            )
+            self.cache.mark_healthy(True)
+            self._cache_metadata(video_id, metadata_json)
+            logger.info("transcript_saved", video_id=video_id, language=language)
 
             return True
         except Exception as e:
+            self._mark_failure(e)
             logger.error("save_transcript_error", video_id=video_id, error=str(e))
             return False
 
@@ -106,42 +210,70 @@ class TranscriptStorage:
         Returns:
             Transcript text or None if not found
         """
-        if not self.enabled:
+        if not self.is_available():
             return None
 
         try:
-            # Try specific language first
+            # Fetch the language-specific and default keys in one round-trip
+            default_key = self._get_storage_key(video_id)
+            # (read as bytes since transcripts may be stored compressed)
+            client = self.cache.raw_client
             if language:
-                storage_key = self._get_storage_key(video_id, language)
-                transcript = self.cache.client.get(storage_key)
+                pipe = client.pipeline(transaction=False)
+                pipe.get(self._get_storage_key(video_id, language))
+                pipe.get(default_key)
+                transcript, default_transcript = pipe.execute()
+                self.cache.mark_healthy(True)
                 if transcript:
                     logger.info("transcript_retrieved", video_id=video_id, language=language)
-                    return transcript
+                    return _decode_transcript(transcript)
+            else:
+                default_transcript = client.get(default_key)
+                self.cache.mark_healthy(True)
 
-            # Try default (no language specified) - look for any language
-            # First check if there's a default key
-            storage_key = self._get_storage_key(video_id)
-            transcript = self.cache.client.get(storage_key)
-            if transcript:
+            if default_transcript:
                 logger.info("transcript_retrieved", video_id=video_id, language="default")
-                return transcript
+                return _decode_transcript(default_transcript)
 
             # If no default, try to find any language variant
             pattern = f"{self.STORAGE_PREFIX}:{video_id}:*"
-            keys = self.cache.client.keys(pattern)
-            if keys:
+            key = next(self.cache.client.scan_iter(match=pattern, count=100), None)
+            if key:
                 # Get the first available transcript
-                transcript = self.cache.client.get(keys[0])
+                transcript = client.get(key)
                 if transcript:
                     logger.info("transcript_retrieved", video_id=video_id, language="any")
-                    return transcript
+                    return _decode_transcript(transcript)
 
             logger.debug("transcript_not_found", video_id=video_id, language=language)
             return None
         except Exception as e:
+            self._mark_failure(e)
             logger.error("get_transcript_error", video_id=video_id, error=str(e))
             return None
 
+    def _cache_metadata(self, video_id: str, metadata_json) -> None:
+        """Store encoded metadata in the in-process cache, evicting the oldest entry."""
+        self._metadata_cache[video_id] = (time.monotonic() + self.METADATA_CACHE_TTL, metadata_json)
+        self._metadata_cache.move_to_end(video_id)
+        if len(self._metadata_cache) > self.METADATA_CACHE_SIZE:
+            self._metadata_cache.popitem(last=False)
+
+    def _read_metadata(self, video_id: str) -> Optional[Dict]:
+        """Read raw stored metadata (timestamps as epoch seconds), for read-only use."""
+        entry = self._metadata_cache.get(video_id)
+        if entry and entry[0] > time.monotonic():
+            self._metadata_cache.move_to_end(video_id)
+            return _metadata_decoder.decode(entry[1])
+
+        metadata_key = self._get_metadata_key(video_id)
+        metadata_json = self.cache.client.get(metadata_key)
+        if metadata_json:
+            self._cache_metadata(video_id, metadata_json)
+            return _metadata_decoder.decode(metadata_json)
+        self._metadata_cache.pop(video_id, None)
+        return None
+
     def get_metadata(self, video_id: str) -> Optional[Dict]:
         """
         Get metadata for a stored transcript.
@@ -152,16 +284,14 @@ class TranscriptStorage:
         Returns:
             Metadata dictionary or None if not found
         """
-        if not self.enabled:
+        if not self.is_available():
             return None
 
         try:
-            metadata_key = self._get_metadata_key(video_id)
-            metadata_json = self.cache.client.get(metadata_key)
-            if metadata_json:
-                return json.loads(metadata_json)
-            return None
+            metadata = self._read_metadata(video_id)
+            return _format_timestamps(metadata) if metadata else None
         except Exception as e:
+            self._mark_failure(e)
             logger.error("get_metadata_error", video_id=video_id, error=str(e))
             return None
 
@@ -175,24 +305,38 @@ class TranscriptStorage:
         Returns:
             List of video metadata dictionaries
         """
-        if not self.enabled:
+        if not self.is_available():
             return []
 
         try:
             pattern = f"{self.METADATA_PREFIX}:*"
-            keys = self.cache.client.keys(pattern)[:limit]
+            keys = self._scan(pattern, limit=limit)
+            self.cache.mark_healthy(True)
+            if not keys:
+                logger.info("videos_listed", count=0)
+                return []
+
+            # Fetch all metadata in a single round-trip
+            values = self.cache.client.mget(keys)
 
+            prefix_len = len(self.METADATA_PREFIX) + 1
             videos = []
-            for key in keys:
-                video_id = key.replace(f"{self.METADATA_PREFIX}:", "")
-                metadata = self.get_metadata(video_id)
-                if metadata:
-                    metadata["video_id"] = video_id
-                    videos.append(metadata)
+            for key, metadata_json in zip(keys, values):
+                if not metadata_json:
+                    continue
+                video_id = key[prefix_len:]
+                try:
+                    metadata = _metadata_decoder.decode(metadata_json)
+                except msgspec.DecodeError as e:
+                    logger.error("get_metadata_error", video_id=video_id, error=str(e))
+                    continue
+                metadata["video_id"] = video_id
+                videos.append(_format_timestamps(metadata))
 
             logger.info("videos_listed", count=len(videos))
             return videos
         except Exception as e:
+            self._mark_failure(e)
             logger.error("list_videos_error", error=str(e))
             return []
 
@@ -207,29 +351,38 @@ class TranscriptStorage:
         Returns:
             True if deleted successfully, False otherwise
         """
-        if not self.enabled:
+        if not self.is_available():
             return False
 
         try:
             if language:
                 # Delete specific language
                 storage_key = self._get_storage_key(video_id, language)
-                self.cache.client.delete(storage_key)
+                self.cache.client.unlink(storage_key)
+                self.cache.mark_healthy(True)
                 logger.info("transcript_deleted", video_id=video_id, language=language)
             else:
-                # Delete all languages for this video
+                # Delete all languages for this video, streaming scanned keys
+                # into batched non-blocking UNLINKs
                 pattern = f"{self.STORAGE_PREFIX}:{video_id}*"
-                keys = self.cache.client.keys(pattern)
-                if keys:
-                    self.cache.client.delete(*keys)
-
-                # Delete metadata
-                metadata_key = self._get_metadata_key(video_id)
-                self.cache.client.delete(metadata_key)
+                pipe = self.cache.client.pipeline(transaction=False)
+                batch = []
+                for key in self.cache.client.scan_iter(match=pattern, count=self.SCAN_COUNT):
+                    batch.append(key)
+                    if len(batch) >= self.SCAN_COUNT:
+                        pipe.unlink(*batch)
+                        batch = []
+                # Delete metadata in the same batch
+                batch.append(self._get_metadata_key(video_id))
+                pipe.unlink(*batch)
+                pipe.execute()
+                self.cache.mark_healthy(True)
+                self._metadata_cache.pop(video_id, None)
                 logger.info("transcript_deleted", video_id=video_id, language="all")
 
             return True
         except Exception as e:
+            self._mark_failure(e)
             logger.error("delete_transcript_error", video_id=video_id, error=str(e))
             return False
 
@@ -242,17 +395,19 @@ class TranscriptStorage:
         """
         if not self.enabled:
             return {"enabled": False}
+        if not self.cache.is_available():
+            return {"enabled": True, "error": "Redis unavailable"}
 
         try:
-            transcript_keys = self.cache.client.keys(f"{self.STORAGE_PREFIX}:*")
-            metadata_keys = self.cache.client.keys(f"{self.METADATA_PREFIX}:*")
-
-            return {
+            stats = {
                 "enabled": True,
-                "total_transcripts": len(transcript_keys),
-                "total_videos": len(metadata_keys),
+                "total_transcripts": self._count(f"{self.STORAGE_PREFIX}:*"),
+                "total_videos": self._count(f"{self.METADATA_PREFIX}:*"),
             }
+            self.cache.mark_healthy(True)
+            return stats
         except Exception as e:
+            self._mark_failure(e)
             logger.error("storage_stats_error", error=str(e))
             return {"enabled": True, "error": str(e)}
 
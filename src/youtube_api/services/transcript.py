@@ -1,14 +1,29 @@
 """YouTube transcript/caption service."""
 
 import asyncio
+import threading
 from typing import List, Optional, Tuple
 
 import structlog
-from youtube_transcript_api import YouTubeTranscriptApi
+from youtube_transcript_api import (
+    AgeRestricted,
+    InvalidVideoId,
+    NoTranscriptFound,
+    RequestBlocked,
+    TranscriptsDisabled,
+    VideoUnavailable,
+    YouTubeTranscriptApi,
+)
 from youtube_transcript_api.proxies import WebshareProxyConfig
 
 from ..config import get_settings
-from ..exceptions import InvalidURLError, TranscriptNotFoundError
+from ..exceptions import (
+    InvalidURLError,
+    TranscriptNotFoundError,
+    UpstreamServiceError,
+    VideoRestrictedError,
+    YouTubeAPIError,
+)
 from ..utils.url_parser import get_youtube_video_id
 from .cache import cached
 
@@ -18,6 +33,32 @@ logger = structlog.get_logger(__name__)
 _proxy_config: Optional[WebshareProxyConfig] = None
 _proxy_config_loaded: bool = False
 
+# Transcript API client per worker thread. Each reuses its HTTP session across
+# requests, but requests.Session (cookies, adapters) is not safe to share between
+# the asyncio.to_thread workers that call it concurrently.
+_thread_local = threading.local()
+
+
+# Failures meaning the transcript really doesn't exist; only these are negative-cached
+TRANSCRIPT_ABSENT_ERRORS = (NoTranscriptFound, TranscriptsDisabled, VideoUnavailable)
+
+
+def _transcript_error(
+    error: Exception, video_id: str, languages: Optional[List[str]] = None
+) -> YouTubeAPIError:
+    """Map a youtube_transcript_api failure to a client error or a transient upstream error."""
+    if isinstance(error, TRANSCRIPT_ABSENT_ERRORS):
+        return TranscriptNotFoundError(video_id, languages)
+    # Retrying these can never succeed, so they are client errors, not upstream failures
+    if isinstance(error, InvalidVideoId):
+        return InvalidURLError(video_id)
+    if isinstance(error, AgeRestricted):
+        return VideoRestrictedError(video_id)
+    return UpstreamServiceError(
+        f"Failed to fetch transcript for video {video_id}",
+        503 if isinstance(error, RequestBlocked) else 502,
+    )
+
 
 def get_proxy_config() -> Optional[WebshareProxyConfig]:
     """Get Webshare proxy configuration from settings."""
@@ -43,11 +84,20 @@ def get_proxy_config() -> Optional[WebshareProxyConfig]:
 
 
 def create_youtube_api() -> YouTubeTranscriptApi:
-    """Create YouTubeTranscriptApi instance with optional proxy."""
-    proxy_config = get_proxy_config()
-    if proxy_config:
-        return YouTubeTranscriptApi(proxy_config=proxy_config)
-    return YouTubeTranscriptApi()
+    """
+    Get or create this thread's YouTubeTranscriptApi instance with optional proxy.
+
+    The instance is reused so its HTTP session keeps connections to YouTube alive.
+    """
+    api = getattr(_thread_local, "youtube_api", None)
+    if api is None:
+        proxy_config = get_proxy_config()
+        if proxy_config:
+            api = YouTubeTranscriptApi(proxy_config=proxy_config)
+        else:
+            api = YouTubeTranscriptApi()
+        _thread_local.youtube_api = api
+    return api
 
 
 class TranscriptService:
@@ -70,6 +120,8 @@ class TranscriptService:
         api = create_youtube_api()
         transcript_list = api.list(video_id)
         available_languages = [t.language_code for t in transcript_list]
+        if not available_languages:
+            raise NoTranscriptFound(video_id, languages or [], transcript_list)
 
         if languages:
             for lang in languages:
@@ -85,7 +137,51 @@ class TranscriptService:
         return api.fetch(video_id, languages=[available_languages[0]]), available_languages
 
     @staticmethod
-    @cached(prefix="video_captions", ttl=3600)
+    # Shared by get_captions and get_timestamps so one YouTube fetch serves both
+    @cached(prefix="video_transcript_raw", ttl=3600, negative_cache=(TranscriptNotFoundError,))
+    async def _fetch_raw_transcript(
+        video_id: str, languages: Optional[List[str]] = None
+    ) -> dict:
+        """
+        Fetch a transcript and reduce it to JSON-serializable snippets.
+
+        Args:
+            video_id: YouTube video ID
+            languages: Preferred transcript languages
+
+        Returns:
+            Dict with language_code, available_languages and [start, text] snippets
+
+        Raises:
+            TranscriptNotFoundError: If no transcript is available
+            VideoRestrictedError: If the video is age-restricted
+            UpstreamServiceError: If YouTube fails transiently (not cached)
+        """
+        try:
+            transcript, available = await asyncio.to_thread(
+                TranscriptService._get_transcript_with_fallback, video_id, languages
+            )
+        except Exception as e:
+            logger.error("transcript_error", video_id=video_id, error=str(e))
+            raise _transcript_error(e, video_id, languages)
+
+        logger.info(
+            "transcript_fetched",
+            video_id=video_id,
+            language=transcript.language_code,
+            snippet_count=len(transcript),
+            available_languages=available,
+        )
+
+        return {
+            "language_code": transcript.language_code,
+            "available_languages": available,
+            "snippets": [[snippet.start, snippet.text] for snippet in transcript],
+        }
+
+    @staticmethod
+    # Published transcripts rarely change: cache for 30 days
+    @cached(prefix="video_captions", ttl=2592000, negative_cache=(TranscriptNotFoundError,))
     async def get_captions(url: str, languages: Optional[List[str]] = None) -> str:
         """
         Get video captions/transcript as plain text.
@@ -100,6 +196,8 @@ class TranscriptService:
         Raises:
             InvalidURLError: If URL cannot be parsed
             TranscriptNotFoundError: If no transcript is available
+            VideoRestrictedError: If the video is age-restricted
+            UpstreamServiceError: If YouTube fails transiently (not cached)
         """
         logger.info("fetching_captions", url=url, languages=languages)
 
@@ -110,48 +208,35 @@ class TranscriptService:
         if not video_id:
             raise InvalidURLError(url)
 
-        try:
-            transcript, available = await asyncio.to_thread(
-                TranscriptService._get_transcript_with_fallback, video_id, languages
-            )
+        raw = await TranscriptService._fetch_raw_transcript(video_id, languages)
 
-            logger.info(
-                "transcript_fetched",
-                video_id=video_id,
-                language=transcript.language_code,
-                snippet_count=len(transcript),
-                available_languages=available,
-            )
+        # A list (not a generator) lets str.join size the result in one pass
+        caption_text = " ".join([text for _, text in raw["snippets"]])
+        logger.debug("captions_combined", char_count=len(caption_text))
 
-            caption_text = " ".join(snippet.text for snippet in transcript)
-            logger.debug("captions_combined", char_count=len(caption_text))
-            
-            # Auto-save transcript to persistent storage if enabled
-            try:
-                from .storage import get_storage
-                storage = get_storage()
-                if storage.enabled:
-                    # Save in background (fire and forget)
-                    asyncio.create_task(
-                        asyncio.to_thread(
-                            storage.save_transcript,
-                            video_id,
-                            caption_text,
-                            transcript.language_code,
-                        )
+        # Auto-save transcript to persistent storage if enabled
+        try:
+            from .storage import get_storage
+            storage = get_storage()
+            # Skipped while Redis is backing off, instead of waiting out its timeout
+            if storage.is_available():
+                # Save in background (fire and forget)
+                asyncio.create_task(
+                    asyncio.to_thread(
+                        storage.save_transcript,
+                        video_id,
+                        caption_text,
+                        raw["language_code"],
                     )
-            except Exception as e:
-                # Don't fail the request if storage fails
-                logger.debug("auto_save_failed", video_id=video_id, error=str(e))
-            
-            return caption_text
-
+                )
         except Exception as e:
-            logger.error("transcript_error", video_id=video_id, error=str(e))
-            raise TranscriptNotFoundError(video_id, languages)
+            # Don't fail the request if storage fails
+            logger.debug("auto_save_failed", video_id=video_id, error=str(e))
+
+        return caption_text
 
     @staticmethod
-    @cached(prefix="video_timestamps", ttl=3600)
+    @cached(prefix="video_timestamps", ttl=2592000, negative_cache=(TranscriptNotFoundError,))
     async def get_timestamps(
         url: str, languages: Optional[List[str]] = None
     ) -> List[str]:
@@ -168,6 +253,8 @@ class TranscriptService:
         Raises:
             InvalidURLError: If URL cannot be parsed
             TranscriptNotFoundError: If no transcript is available
+            VideoRestrictedError: If the video is age-restricted
+            UpstreamServiceError: If YouTube fails transiently (not cached)
         """
         logger.info("fetching_timestamps", url=url, languages=languages)
 
@@ -178,27 +265,21 @@ class TranscriptService:
         if not video_id:
             raise InvalidURLError(url)
 
-        try:
-            transcript, _ = await asyncio.to_thread(
-                TranscriptService._get_transcript_with_fallback, video_id, languages
-            )
+        raw = await TranscriptService._fetch_raw_transcript(video_id, languages)
 
-            timestamps = []
-            for snippet in transcript:
-                start = int(snippet.start)
-                minutes, seconds = divmod(start, 60)
-                timestamp = f"{minutes}:{seconds:02d} - {snippet.text}"
-                timestamps.append(timestamp)
+        # %-formatting skips the per-item format-spec parsing an f-string does
+        timestamps = [
+            "%d:%02d - %s" % (start // 60, start % 60, text)
+            for seconds, text in raw["snippets"]
+            for start in (int(seconds),)
+        ]
 
-            logger.info("timestamps_generated", count=len(timestamps))
-            return timestamps
-
-        except Exception as e:
-            logger.error("timestamp_error", video_id=video_id, error=str(e))
-            raise TranscriptNotFoundError(video_id, languages)
+        logger.info("timestamps_generated", count=len(timestamps))
+        return timestamps
 
     @staticmethod
-    @cached(prefix="video_languages", ttl=3600)
+    # New caption tracks can be added: cache for 24 hours
+    @cached(prefix="video_languages", ttl=86400, negative_cache=(TranscriptNotFoundError,))
     async def get_available_languages(url: str) -> List[dict]:
         """
         List available transcript languages for a video.
@@ -212,6 +293,8 @@ class TranscriptService:
         Raises:
             InvalidURLError: If URL cannot be parsed
             TranscriptNotFoundError: If video has no transcripts
+            VideoRestrictedError: If the video is age-restricted
+            UpstreamServiceError: If YouTube fails transiently (not cached)
         """
         logger.info("listing_languages", url=url)
 
@@ -245,4 +328,4 @@ class TranscriptService:
 
         except Exception as e:
             logger.error("languages_error", video_id=video_id, error=str(e))
-            raise TranscriptNotFoundError(video_id)
+            raise _transcript_error(e, video_id)
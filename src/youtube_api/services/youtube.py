@@ -1,13 +1,15 @@
 """YouTube video metadata service using httpx for async HTTP."""
 
+from importlib.util import find_spec
 from typing import Optional
 from urllib.parse import urlencode
 
 import httpx
 import structlog
 
+from .. import __version__
 from ..config import get_settings
-from ..exceptions import InvalidURLError, VideoNotFoundError
+from ..exceptions import InvalidURLError, UpstreamServiceError, VideoNotFoundError
 from ..utils.url_parser import get_youtube_video_id
 from .cache import cached
 
@@ -16,17 +18,24 @@ logger = structlog.get_logger(__name__)
 # Shared HTTP client for connection pooling
 _http_client: Optional[httpx.AsyncClient] = None
 
+# HTTP/2 multiplexes concurrent requests over one connection; it needs the h2 package
+HTTP2_AVAILABLE = find_spec("h2") is not None
+
 
 async def get_http_client() -> httpx.AsyncClient:
     """Get or create the shared HTTP client with connection pooling."""
     global _http_client
     if _http_client is None:
         _http_client = httpx.AsyncClient(
-            timeout=30.0,
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(10.0, connect=5.0),
             limits=httpx.Limits(
-                max_keepalive_connections=20,
-                max_connections=100,
+                max_keepalive_connections=50,
+                max_connections=200,
+                keepalive_expiry=60.0,
             ),
+            # A stable User-Agent lets upstream CDNs cache our responses consistently
+            headers={"User-Agent": f"youtube-summaries-api/{__version__}"},
         )
     return _http_client
 
@@ -43,7 +52,8 @@ class YouTubeService:
     """Service for fetching YouTube video metadata."""
 
     @staticmethod
-    @cached(prefix="video_data", ttl=3600)
+    # Video metadata is effectively immutable: cache for 7 days
+    @cached(prefix="video_data", ttl=604800, negative_cache=(VideoNotFoundError,))
     async def get_video_data(url: str) -> dict:
         """
         Get video metadata from YouTube oEmbed API.
@@ -57,6 +67,7 @@ class YouTubeService:
         Raises:
             InvalidURLError: If URL cannot be parsed
             VideoNotFoundError: If video doesn't exist
+            UpstreamServiceError: If YouTube fails transiently (not cached)
         """
         logger.info("fetching_video_data", url=url)
 
@@ -104,12 +115,19 @@ class YouTubeService:
                 "thumbnail_url": video_data.get("thumbnail_url"),
             }
 
+        except VideoNotFoundError:
+            raise
+
         except httpx.HTTPStatusError as e:
-            logger.error("oembed_api_error", status_code=e.response.status_code)
-            if e.response.status_code == 404:
+            status_code = e.response.status_code
+            logger.error("oembed_api_error", status_code=status_code)
+            if status_code == 404:
                 raise VideoNotFoundError(video_id)
-            raise VideoNotFoundError(f"Failed to fetch video data: {e}")
+            raise UpstreamServiceError(
+                f"Failed to fetch video data: {e}",
+                503 if status_code == 429 else 502,
+            )
 
         except Exception as e:
             logger.error("video_data_error", error=str(e))
-            raise VideoNotFoundError(f"Error getting video data: {e}")
+            raise UpstreamServiceError(f"Error getting video data: {e}")
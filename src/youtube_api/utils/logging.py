@@ -3,8 +3,17 @@
 import logging
 import sys
 
+import msgspec
 import structlog
 
+# C-backed JSON encoder for production logs; unknown objects fall back to repr()
+_json_encoder = msgspec.json.Encoder(enc_hook=repr)
+
+
+def _json_serializer(event_dict: dict, **kwargs) -> str:
+    """Serialize a log event with msgspec (JSONRenderer's json.dumps kwargs are ignored)."""
+    return _json_encoder.encode(event_dict).decode()
+
 
 def setup_logging(json_logs: bool = False, log_level: str = "INFO") -> None:
     """
@@ -14,29 +23,36 @@ def setup_logging(json_logs: bool = False, log_level: str = "INFO") -> None:
         json_logs: If True, output logs as JSON (for production). If False, use colored console output.
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
     """
+    level = getattr(logging, log_level.upper())
+
     # Set up standard library logging
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
-        level=getattr(logging, log_level.upper()),
+        level=level,
     )
 
-    # Configure structlog processors
+    # Configure structlog processors (kept minimal: they run for every log record)
     shared_processors = [
         structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_log_level,
         structlog.stdlib.add_logger_name,
-        structlog.stdlib.PositionalArgumentsFormatter(),
         structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.UnicodeDecoder(),
     ]
 
+    if level <= logging.DEBUG:
+        # Only needed for positional-args/stack_info log calls while debugging
+        shared_processors += [
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.UnicodeDecoder(),
+        ]
+
     if json_logs:
         # Production: JSON logs
         processors = shared_processors + [
             structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer(),
+            structlog.processors.JSONRenderer(serializer=_json_serializer),
         ]
     else:
         # Development: Colored console output
@@ -46,7 +62,8 @@ def setup_logging(json_logs: bool = False, log_level: str = "INFO") -> None:
 
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.stdlib.BoundLogger,
+        # Drop calls below the configured level before any processor runs
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
@@ -37,11 +37,16 @@ class PromptService:
         self.prompts_dir = os.path.abspath(os.path.join(current_dir, "../../../prompts"))
 
         self._cache: Dict[str, PromptInfo] = {}
+        # Flat name -> content map so get_prompt is a single lookup
+        self._contents: Dict[str, Optional[str]] = {}
+        # Content-less prompt views grouped by category, built once per load
+        self._by_category: Dict[str, List[PromptInfo]] = {}
+        self._categories: List[str] = []
         self._loaded = False
 
     def _load_prompts(self) -> None:
         """
-        Scan the prompts directory and populate the cache.
+        Scan the prompts directory and populate the cache with prompt content.
         This is called lazily on the first request.
         """
         if self._loaded:
@@ -53,33 +58,57 @@ class PromptService:
 
         logger.info("loading_prompts", path=self.prompts_dir)
 
-        count = 0
-        for root, dirs, files in os.walk(self.prompts_dir):
-            for file in files:
-                if file == "system.md":
-                    # The parent folder name is the prompt name
-                    prompt_name = os.path.basename(root)
+        count = self._scan_directory(self.prompts_dir, depth=0, category=None)
+
+        for prompt in self._cache.values():
+            self._contents[prompt["name"]] = prompt["content"]
+            light_info = {k: v for k, v in prompt.items() if k != "content"}
+            self._by_category.setdefault(prompt["category"], []).append(light_info)
+        self._categories = sorted(self._by_category)
 
-                    # The grandparent folder is the category (if any)
-                    rel_path = os.path.relpath(root, self.prompts_dir)
-                    parts = rel_path.split(os.sep)
+        self._loaded = True
+        logger.info("prompts_loaded", count=count)
 
-                    category = "uncategorized"
-                    if len(parts) > 1:
-                        category = parts[0]
+    def _scan_directory(self, path: str, depth: int, category: Optional[str]) -> int:
+        """
+        Recursively collect system.md prompts below a directory.
 
-                    full_path = os.path.join(root, file)
+        Args:
+            path: Directory to scan
+            depth: Nesting depth of path below the prompts directory
+            category: Name of the top-level folder this path is under (if any)
 
+        Returns:
+            Number of prompts found
+        """
+        count = 0
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    # Top-level folders name the category for prompts nested below them
+                    sub_category = entry.name if depth == 0 else category
+                    count += self._scan_directory(entry.path, depth + 1, sub_category)
+                elif entry.name == "system.md" and entry.is_file():
+                    # The parent folder name is the prompt name
+                    prompt_name = os.path.basename(path)
                     self._cache[prompt_name] = {
                         "name": prompt_name,
-                        "category": category,
-                        "path": full_path,
-                        "content": None  # Content loaded on demand
+                        "category": category if depth > 1 else "uncategorized",
+                        "path": entry.path,
+                        "content": self._read_prompt(entry.path),
                     }
                     count += 1
-
-        self._loaded = True
-        logger.info("prompts_loaded", count=count)
+        return count
+
+    @staticmethod
+    def _read_prompt(path: str) -> Optional[str]:
+        """Read a prompt file, returning None if it cannot be read."""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except Exception as e:
+            logger.error("error_reading_prompt", path=path, error=str(e))
+            return None
 
     def list_prompts(self) -> List[PromptInfo]:
         """Return a list of all available prompts (without content)."""
@@ -93,46 +122,31 @@ class PromptService:
     def get_prompt(self, name: str) -> Optional[str]:
         """
         Get the content of a specific prompt by name.
-        Content is cached in memory after first read.
+        Content is read into memory when prompts are loaded.
         """
-        self._load_prompts()
-
-        if name not in self._cache:
-            return None
-
-        prompt_info = self._cache[name]
-
-        # Load content if not already in memory
-        if prompt_info["content"] is None:
-            try:
-                with open(prompt_info["path"], "r", encoding="utf-8") as f:
-                    prompt_info["content"] = f.read()
-            except Exception as e:
-                logger.error("error_reading_prompt", path=prompt_info["path"], error=str(e))
-                return None
-
-        return prompt_info["content"]
+        if not self._loaded:
+            self._load_prompts()
+        return self._contents.get(name)
 
     def refresh(self) -> None:
         """Clear cache and reload prompts from disk."""
         self._cache = {}
+        self._contents = {}
+        self._by_category = {}
+        self._categories = []
         self._loaded = False
         self._load_prompts()
 
     def get_prompts_by_category(self, category: str) -> List[PromptInfo]:
         """Get all prompts in a specific category."""
         self._load_prompts()
-        return [
-            {k: v for k, v in p.items() if k != "content"}
-            for p in self._cache.values()
-            if p["category"] == category
-        ]
+        # Copies, so callers can't modify the shared index
+        return [dict(p) for p in self._by_category.get(category, ())]
 
     def get_categories(self) -> List[str]:
         """Get list of all prompt categories."""
         self._load_prompts()
-        categories = set(p["category"] for p in self._cache.values())
-        return sorted(list(categories))
+        return list(self._categories)
 
 
 # Singleton instance
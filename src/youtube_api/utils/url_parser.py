@@ -1,12 +1,62 @@
 """YouTube URL parsing utilities."""
 
+import re
+import string
+from functools import lru_cache
 from typing import Optional
-from urllib.parse import urlparse, parse_qs
+from urllib.parse import urlparse
 
 import structlog
 
 logger = structlog.get_logger(__name__)
 
+# A bare video ID is exactly 11 of these URL-safe base64 characters; a set
+# check is cheaper than a regex match on strings this short
+_ID_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+
+# Supported URL shapes (with or without scheme), matched in one pass before
+# falling back to urlparse. The lookahead rejects IDs longer than 11 characters.
+_YT_URL_RE = re.compile(
+    r"(?:https?://)?"
+    r"(?:(?:www\.|m\.|music\.)?youtube\.com/(?:watch\?(?:[^&#]*&)*?v=|(?:embed|v|shorts|live)/)"
+    r"|(?:www\.)?youtu\.be/)"
+    r"([A-Za-z0-9_-]{11})(?![A-Za-z0-9_-])"
+)
+
+# A video ID that is not followed by further ID characters
+_ID_AT_RE = re.compile(r"[A-Za-z0-9_-]{11}(?![A-Za-z0-9_-])")
+
+# Hostnames accepted by the urlparse fallback
+_YOUTU_BE_HOSTS = frozenset({"youtu.be", "www.youtu.be"})
+_YOUTUBE_HOSTS = frozenset({
+    "www.youtube.com",
+    "youtube.com",
+    "m.youtube.com",
+    "music.youtube.com",
+})
+
+# First path segments that are followed by the video ID
+_ID_PATH_KINDS = frozenset({"embed", "v", "shorts", "live"})
+
+# The v= parameter of a watch URL query string (the only parameter we read)
+_WATCH_QUERY_RE = re.compile(r"(?:^|&)v=([^&]+)")
+
+
+def _valid_id(candidate: str) -> Optional[str]:
+    """Return candidate if it is a well-formed video ID, else None."""
+    return candidate if len(candidate) == 11 and _ID_CHARS.issuperset(candidate) else None
+
+
+def _id_at(text: str, pos: int = 0) -> Optional[str]:
+    """Return the video ID starting at pos, rejecting runs longer than 11 characters."""
+    match = _ID_AT_RE.match(text, pos)
+    return match.group() if match else None
+
+
+# Longest input worth memoizing; URLs are far shorter, and caching arbitrarily
+# large request strings would pin them in memory
+MAX_MEMOIZED_LENGTH = 2048
+
 
 def get_youtube_video_id(url_or_id: str) -> Optional[str]:
     """
@@ -29,74 +79,59 @@ def get_youtube_video_id(url_or_id: str) -> Optional[str]:
     Returns:
         Video ID string or None if extraction fails
     """
-    logger.debug("parsing_youtube_url", input=url_or_id)
+    if len(url_or_id) > MAX_MEMOIZED_LENGTH:
+        return _extract_video_id(url_or_id)
+    return _memoized_video_id(url_or_id)
+
 
-    # Check if it's already a video ID (11 characters, alphanumeric with - and _)
-    if len(url_or_id) == 11 and all(c.isalnum() or c in "-_" for c in url_or_id):
-        logger.debug("direct_video_id_detected", video_id=url_or_id)
+def _extract_video_id(url_or_id: str) -> Optional[str]:
+    """Extract the video ID without memoization (see get_youtube_video_id)."""
+    # Check if it's already a video ID (11 characters, alphanumeric with - and _);
+    # the length check skips the character scan for every URL input
+    if len(url_or_id) == 11 and _ID_CHARS.issuperset(url_or_id):
         return url_or_id
 
-    # Try to parse as URL
+    # Fast path: a single regex match covers the common URL shapes
+    match = _YT_URL_RE.match(url_or_id)
+    if match:
+        return match.group(1)
+
+    # Fall back to parsing as URL, adding a missing scheme up front so it is parsed once
+    url = url_or_id
+    if not url[:8].lower().startswith(("http://", "https://", "//")):
+        if "youtube.com" not in url and "youtu.be" not in url:
+            logger.warning("invalid_url_format", input=url_or_id)
+            return None
+        url = f"https://{url}"
+
+    # urlparse only raises for malformed netlocs (e.g. unbalanced IPv6 brackets)
     try:
-        parsed_url = urlparse(url_or_id)
-        hostname = parsed_url.hostname
-
-        # Handle missing scheme
-        if not hostname:
-            if "youtube.com" in url_or_id or "youtu.be" in url_or_id:
-                parsed_url = urlparse(f"https://{url_or_id}")
-                hostname = parsed_url.hostname
-            else:
-                logger.warning("invalid_url_format", input=url_or_id)
-                return None
-
-        # youtu.be format (short links)
-        if hostname in ("youtu.be", "www.youtu.be"):
-            video_id = parsed_url.path[1:].split("?")[0].split("&")[0]
-            logger.debug("extracted_from_youtu_be", video_id=video_id)
-            return video_id
-
-        # youtube.com formats
-        if hostname in (
-            "www.youtube.com",
-            "youtube.com",
-            "m.youtube.com",
-            "music.youtube.com",
-        ):
-            # Standard watch URL: /watch?v=VIDEO_ID
-            if parsed_url.path == "/watch" or parsed_url.path.startswith("/watch?"):
-                query_params = parse_qs(parsed_url.query)
-                video_id = query_params.get("v", [None])[0]
-                logger.debug("extracted_from_watch_url", video_id=video_id)
-                return video_id
-
-            # Embed URL: /embed/VIDEO_ID
-            if parsed_url.path.startswith("/embed/"):
-                video_id = parsed_url.path.split("/")[2].split("?")[0]
-                logger.debug("extracted_from_embed_url", video_id=video_id)
-                return video_id
-
-            # Old format: /v/VIDEO_ID
-            if parsed_url.path.startswith("/v/"):
-                video_id = parsed_url.path.split("/")[2].split("?")[0]
-                logger.debug("extracted_from_v_url", video_id=video_id)
-                return video_id
-
-            # Shorts format: /shorts/VIDEO_ID
-            if parsed_url.path.startswith("/shorts/"):
-                video_id = parsed_url.path.split("/")[2].split("?")[0]
-                logger.debug("extracted_from_shorts_url", video_id=video_id)
-                return video_id
-
-            # Live format: /live/VIDEO_ID
-            if parsed_url.path.startswith("/live/"):
-                video_id = parsed_url.path.split("/")[2].split("?")[0]
-                logger.debug("extracted_from_live_url", video_id=video_id)
-                return video_id
-
-    except Exception as e:
+        parsed_url = urlparse(url)
+    except ValueError as e:
         logger.error("url_parsing_failed", error=str(e), input=url_or_id)
         return None
+    hostname = parsed_url.hostname
+
+    # youtu.be format (short links)
+    # (IDs are fixed-width, so match in place instead of splitting on delimiters)
+    if hostname in _YOUTU_BE_HOSTS:
+        return _id_at(parsed_url.path, 1)
+
+    # youtube.com formats
+    if hostname in _YOUTUBE_HOSTS:
+        # Standard watch URL: /watch?v=VIDEO_ID
+        if parsed_url.path == "/watch" or parsed_url.path.startswith("/watch?"):
+            match = _WATCH_QUERY_RE.search(parsed_url.query)
+            return _valid_id(match.group(1)) if match else None
+
+        # Embed, old /v/, shorts and live URLs: /<kind>/VIDEO_ID
+        kind, _, rest = parsed_url.path[1:].partition("/")
+        if kind in _ID_PATH_KINDS:
+            return _id_at(rest)
 
     logger.warning("video_id_extraction_failed", input=url_or_id)
     return None
+
+
+# Pure function called by every service and router for the same URL: memoize it
+_memoized_video_id = lru_cache(maxsize=4096)(_extract_video_id)
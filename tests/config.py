@@ -2,6 +2,7 @@
 Test configuration and settings.
 """
 import os
+import sys
 
 # Base API URL
 BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
@@ -42,6 +43,25 @@ TEST_LANGUAGES = {
 # Number of iterations for performance tests
 PERFORMANCE_ITERATIONS = 5
 
+# Run a test's iterations concurrently instead of one at a time
+CONCURRENT_ITERATIONS = os.getenv("API_TEST_CONCURRENT", "0") == "1"
+
+# Run independent endpoint tests in a suite at the same time (off by default:
+# overlapping tests skew the reported latencies and risk hitting rate limits)
+CONCURRENT_TESTS = os.getenv("API_TEST_CONCURRENT_TESTS", "0") == "1"
+
+# Most iterations of one test in flight at once when running concurrently
+MAX_CONCURRENCY = int(os.getenv("API_TEST_MAX_CONCURRENCY", "10"))
+
+# Worker threads per test's iterations; 1 runs them one after another
+ITERATION_CONCURRENCY = MAX_CONCURRENCY if CONCURRENT_ITERATIONS else 1
+
+# Serial iterations per second, to stay under the API rate limits (0 = unlimited)
+ITERATION_RATE = float(os.getenv("API_TEST_RATE", "2"))
+
+# Serial iterations allowed back to back before ITERATION_RATE applies
+ITERATION_BURST = int(os.getenv("API_TEST_BURST", "1"))
+
 # Request timeout (seconds)
 REQUEST_TIMEOUT = 60
 
@@ -56,3 +76,26 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
+
+
+# Plain output when piped or logged, or when NO_COLOR is set (https://no-color.org)
+USE_COLOR = sys.stdout.isatty() and not os.getenv("NO_COLOR")
+
+if not USE_COLOR:
+    for _name in vars(Colors).copy():
+        if not _name.startswith("_"):
+            setattr(Colors, _name, "")
+
+
+# Section banners built once from the colors above
+BANNER = "=" * 70
+HEADER_STYLE = f"{Colors.BOLD}{Colors.HEADER}"
+BANNER_LINE = f"{HEADER_STYLE}{BANNER}{Colors.ENDC}"
+
+# Status marks built once from the colors above
+CHECK_MARK = f"{Colors.OKGREEN}✓{Colors.ENDC}"
+OK_MARK = f"{Colors.OKGREEN}✓ OK{Colors.ENDC}"
+FAIL_MARK = f"{Colors.FAIL}✗ FAILED{Colors.ENDC}"
+WARN_MARK = f"{Colors.WARNING}⚠{Colors.ENDC}"
+PASS_LABEL = f"{Colors.OKGREEN}✓ PASS{Colors.ENDC}"
+FAIL_LABEL = f"{Colors.FAIL}✗ FAIL{Colors.ENDC}"
@@ -4,7 +4,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 from src.youtube_api.app import app
-from src.youtube_api.services.cache import RedisCache, get_cache
+from src.youtube_api.services.cache import get_cache
 
 
 @pytest.fixture
@@ -6,8 +6,8 @@ import sys
 import time
 import argparse
 from datetime import datetime
-from config import BASE_URL, Colors
-from utils import print_test_header, print_summary, make_request
+from config import BASE_URL, Colors, PASS_LABEL, FAIL_LABEL
+from utils import make_request, parse_json, print_test_header
 
 # Import test modules
 import test_health
@@ -30,7 +30,7 @@ def check_api_health():
         return False
 
     if response and response.status_code == 200:
-        data = response.json()
+        data = parse_json(response)
         print(f"  {Colors.OKGREEN}✓ API is healthy{Colors.ENDC}")
         print(f"  Status: {data.get('status')}")
         print(f"  Cache: {data.get('cache_status')}")
@@ -57,15 +57,11 @@ def run_test_suite(suite_name, test_module, skip=False):
         print(f"\n{Colors.WARNING}Skipping {suite_name}...{Colors.ENDC}")
         return []
 
-    print(f"\n{Colors.BOLD}{Colors.HEADER}")
-    print("=" * 70)
-    print(f"  Running {suite_name}")
-    print("=" * 70)
-    print(f"{Colors.ENDC}")
+    print_test_header(f"Running {suite_name}")
 
-    start_time = time.time()
+    start_time = time.perf_counter()
     results = test_module.run_all_tests()
-    elapsed = time.time() - start_time
+    elapsed = time.perf_counter() - start_time
 
     print(f"\n{Colors.OKCYAN}Suite completed in {elapsed:.2f}s{Colors.ENDC}")
 
@@ -74,11 +70,8 @@ def run_test_suite(suite_name, test_module, skip=False):
 
 def generate_report(all_results, total_time):
     """Generate and print final test report."""
-    print(f"\n\n{Colors.BOLD}{Colors.HEADER}")
-    print("=" * 70)
-    print("  FINAL TEST REPORT")
-    print("=" * 70)
-    print(f"{Colors.ENDC}")
+    print()
+    print_test_header("FINAL TEST REPORT")
 
     # Calculate totals
     total_tests = len(all_results)
@@ -113,7 +106,7 @@ def generate_report(all_results, total_time):
     for suite_name, tests in sorted(suites.items()):
         print(f"\n  {Colors.BOLD}{suite_name}:{Colors.ENDC}")
         for test_name, result in tests:
-            status = f"{Colors.OKGREEN}✓ PASS{Colors.ENDC}" if result else f"{Colors.FAIL}✗ FAIL{Colors.ENDC}"
+            status = PASS_LABEL if result else FAIL_LABEL
             print(f"    {test_name:50s} {status}")
 
     # Final status
@@ -163,11 +156,7 @@ def main():
     args = parser.parse_args()
 
     # Print header
-    print(f"\n{Colors.BOLD}{Colors.HEADER}")
-    print("=" * 70)
-    print("  YouTube Summaries API - Performance Test Suite")
-    print("=" * 70)
-    print(f"{Colors.ENDC}")
+    print_test_header("YouTube Summaries API - Performance Test Suite")
     print(f"  Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"  Base URL:   {BASE_URL}\n")
 
@@ -188,7 +177,7 @@ def main():
     skip_prompts = args.skip_prompts or (args.only and args.only != "prompts")
 
     # Run test suites
-    start_time = time.time()
+    start_time = time.perf_counter()
     all_results = []
 
     # Health tests
@@ -211,7 +200,7 @@ def main():
     results = run_test_suite("Prompts Tests", test_prompts, skip_prompts)
     all_results.extend(results)
 
-    total_time = time.time() - start_time
+    total_time = time.perf_counter() - start_time
 
     # Generate final report
     exit_code = generate_report(all_results, total_time)
@@ -1,16 +1,15 @@
 """
 Performance tests for AI-powered endpoints.
 """
-import os
-from config import BASE_URL, PERFORMANCE_ITERATIONS, TEST_VIDEOS, TEST_LANGUAGES, REQUEST_TIMEOUT
-from utils import make_request, measure_performance, print_test_header, Colors
+from config import BASE_URL, TEST_VIDEOS, TEST_LANGUAGES, REQUEST_TIMEOUT
+from utils import make_request, measure_performance, parse_json, print_test_header, Colors
 
 
 def check_ai_available():
     """Check if AI features are available."""
     response, error = make_request("GET", f"{BASE_URL}/")
     if response and not error:
-        data = response.json()
+        data = parse_json(response)
         return data.get("ai_features_available", False)
     return False
 
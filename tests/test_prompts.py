@@ -1,26 +1,85 @@
 """
 Performance tests for Prompt Management endpoints.
 """
-from config import BASE_URL, PERFORMANCE_ITERATIONS, REQUEST_TIMEOUT
-from utils import make_request, measure_performance, print_test_header, Colors
-
-
+from functools import lru_cache
+
+import ijson
+import msgspec
+
+from config import BASE_URL, PERFORMANCE_ITERATIONS, REQUEST_TIMEOUT, CHECK_MARK, WARN_MARK
+from utils import make_request, measure_performance, print_test_header, run_concurrently, parse_json, Colors
+
+
+class _PromptContent(msgspec.Struct):
+    """The only field of GET /prompts/{name} the availability check reads."""
+
+    content: str = ""
+
+
+# Typed decoding skips every other field instead of building a dict for it
+_PROMPT_CONTENT_DECODER = msgspec.json.Decoder(_PromptContent)
+
+# Endpoint URLs, built once at import
+_PROMPTS_URL = f"{BASE_URL}/prompts/"
+_CATEGORIES_URL = f"{BASE_URL}/prompts/categories"
+_REFRESH_URL = f"{BASE_URL}/prompts/refresh"
+_MISSING_PROMPT_URL = f"{BASE_URL}/prompts/nonexistent_prompt_12345"
+_MISSING_CATEGORY_URL = f"{BASE_URL}/prompts/category/nonexistent_category_12345"
+
+
+def stream_prompt_names(limit: int) -> tuple:
+    """
+    Read the prompt total and the first prompt names from GET /prompts/.
+
+    The body is parsed incrementally and the response closed once both the
+    total and `limit` names (or the whole list) have been seen, whichever
+    order the API emits them in, so the rest of the list is not decoded.
+
+    Returns:
+        tuple: (total, names, error_message)
+    """
+    response, error = make_request("GET", _PROMPTS_URL, stream=True, timeout=REQUEST_TIMEOUT)
+    try:
+        if error:
+            return 0, [], error
+
+        total = None
+        names = []
+        names_done = False
+        response.raw.decode_content = True
+        for prefix, event, value in ijson.parse(response.raw):
+            if prefix == "total":
+                total = value
+            elif prefix == "prompts.item.name" and not names_done:
+                names.append(value)
+                names_done = len(names) >= limit
+            elif prefix == "prompts" and event == "end_array":
+                names_done = True
+            else:
+                continue
+            if names_done and total is not None:
+                break
+        return total or 0, names, None
+    finally:
+        if response is not None:
+            response.close()
+
+
+@lru_cache(maxsize=1)
 def get_first_prompt_name():
     """Get the name of the first available prompt."""
-    response, error = make_request("GET", f"{BASE_URL}/prompts/")
-    if response and not error:
-        data = response.json()
-        prompts = data.get("prompts", [])
-        if prompts:
-            return prompts[0].get("name")
+    _, names, error = stream_prompt_names(limit=1)
+    if names and not error:
+        return names[0]
     return None
 
 
+@lru_cache(maxsize=1)
 def get_first_category():
     """Get the name of the first available category."""
-    response, error = make_request("GET", f"{BASE_URL}/prompts/categories")
+    response, error = make_request("GET", _CATEGORIES_URL)
     if response and not error:
-        data = response.json()
+        data = parse_json(response)
         categories = data.get("categories", [])
         if categories:
             return categories[0]
@@ -32,7 +91,7 @@ def test_prompts_list():
     def _test():
         return make_request(
             "GET",
-            f"{BASE_URL}/prompts/",
+            _PROMPTS_URL,
             timeout=REQUEST_TIMEOUT
         )
 
@@ -44,7 +103,7 @@ def test_prompts_categories():
     def _test():
         return make_request(
             "GET",
-            f"{BASE_URL}/prompts/categories",
+            _CATEGORIES_URL,
             timeout=REQUEST_TIMEOUT
         )
 
@@ -59,10 +118,12 @@ def test_prompts_by_category():
         print(f"{Colors.WARNING}  No categories found, skipping test{Colors.ENDC}")
         return None
 
+    url = f"{BASE_URL}/prompts/category/{category}"
+
     def _test():
         return make_request(
             "GET",
-            f"{BASE_URL}/prompts/category/{category}",
+            url,
             timeout=REQUEST_TIMEOUT
         )
 
@@ -77,10 +138,12 @@ def test_prompts_get():
         print(f"{Colors.WARNING}  No prompts found, skipping test{Colors.ENDC}")
         return None
 
+    url = f"{_PROMPTS_URL}{prompt_name}"
+
     def _test():
         return make_request(
             "GET",
-            f"{BASE_URL}/prompts/{prompt_name}",
+            url,
             timeout=REQUEST_TIMEOUT
         )
 
@@ -92,7 +155,7 @@ def test_prompts_refresh():
     def _test():
         return make_request(
             "POST",
-            f"{BASE_URL}/prompts/refresh",
+            _REFRESH_URL,
             timeout=REQUEST_TIMEOUT
         )
 
@@ -104,7 +167,7 @@ def test_prompt_not_found():
     def _test():
         return make_request(
             "GET",
-            f"{BASE_URL}/prompts/nonexistent_prompt_12345",
+            _MISSING_PROMPT_URL,
             timeout=REQUEST_TIMEOUT
         )
 
@@ -116,7 +179,7 @@ def test_category_not_found():
     def _test():
         return make_request(
             "GET",
-            f"{BASE_URL}/prompts/category/nonexistent_category_12345",
+            _MISSING_CATEGORY_URL,
             timeout=REQUEST_TIMEOUT
         )
 
@@ -127,40 +190,33 @@ def test_prompts_availability():
     """Test that prompts are actually available and contain content."""
     print(f"\n{Colors.OKBLUE}Testing prompt content availability...{Colors.ENDC}")
 
-    response, error = make_request("GET", f"{BASE_URL}/prompts/")
+    # Test first few prompts have content
+    total_prompts, prompt_names, error = stream_prompt_names(limit=3)
 
     if error:
         print(f"  {Colors.FAIL}✗ Failed to fetch prompt list: {error}{Colors.ENDC}")
         return False
 
-    data = response.json()
-    total_prompts = data.get("total", 0)
-    prompts = data.get("prompts", [])
-
     print(f"  Total prompts available: {total_prompts}")
 
-    if not prompts:
-        print(f"  {Colors.WARNING}⚠ No prompts found{Colors.ENDC}")
+    if not prompt_names:
+        print(f"  {WARN_MARK} No prompts found")
         return False
 
-    # Test first few prompts have content
-    test_count = min(3, len(prompts))
     content_ok = True
 
-    for i in range(test_count):
-        prompt_name = prompts[i].get("name")
-        response, error = make_request("GET", f"{BASE_URL}/prompts/{prompt_name}")
+    for prompt_name in prompt_names:
+        response, error = make_request("GET", f"{_PROMPTS_URL}{prompt_name}")
 
         if error or not response:
             print(f"  {Colors.FAIL}✗ Failed to fetch prompt '{prompt_name}'{Colors.ENDC}")
             content_ok = False
             continue
 
-        prompt_data = response.json()
-        content = prompt_data.get("content", "")
+        content = _PROMPT_CONTENT_DECODER.decode(response.content).content
 
         if content:
-            print(f"  {Colors.OKGREEN}✓{Colors.ENDC} Prompt '{prompt_name}': {len(content)} characters")
+            print(f"  {CHECK_MARK} Prompt '{prompt_name}': {len(content)} characters")
         else:
             print(f"  {Colors.FAIL}✗ Prompt '{prompt_name}': No content{Colors.ENDC}")
             content_ok = False
@@ -174,33 +230,21 @@ def run_all_tests():
 
     results = []
 
-    # Test list prompts
-    metrics = test_prompts_list()
-    if metrics:
-        metrics.endpoint_name = "prompts_list"
-        passed = metrics.print_report()
-        results.append(("GET /prompts/", passed))
-
-    # Test categories
-    metrics = test_prompts_categories()
-    if metrics:
-        metrics.endpoint_name = "prompts_categories"
-        passed = metrics.print_report()
-        results.append(("GET /prompts/categories", passed))
-
-    # Test prompts by category
-    metrics = test_prompts_by_category()
-    if metrics:
-        metrics.endpoint_name = "prompts_by_category"
-        passed = metrics.print_report()
-        results.append(("GET /prompts/category/{category}", passed))
-
-    # Test get prompt
-    metrics = test_prompts_get()
-    if metrics:
-        metrics.endpoint_name = "prompts_get"
-        passed = metrics.print_report()
-        results.append(("GET /prompts/{name}", passed))
+    # Read-only endpoints run side by side; refresh reloads the prompt
+    # cache, so it runs on its own afterwards
+    independent_tests = [
+        (test_prompts_list, "prompts_list", "GET /prompts/"),
+        (test_prompts_categories, "prompts_categories", "GET /prompts/categories"),
+        (test_prompts_by_category, "prompts_by_category", "GET /prompts/category/{category}"),
+        (test_prompts_get, "prompts_get", "GET /prompts/{name}"),
+    ]
+    all_metrics = run_concurrently(*(test for test, _, _ in independent_tests))
+
+    for metrics, (_, endpoint_name, label) in zip(all_metrics, independent_tests):
+        if metrics:
+            metrics.endpoint_name = endpoint_name
+            passed = metrics.print_report()
+            results.append((label, passed))
 
     # Test refresh
     metrics = test_prompts_refresh()
@@ -212,19 +256,18 @@ def run_all_tests():
     # Test error handling
     print_test_header("ERROR HANDLING")
 
-    metrics = test_prompt_not_found()
-    if metrics:
-        metrics.endpoint_name = "error_handling"
-        metrics.print_report()
-        error_passed = any(code == 404 for code in metrics.status_codes)
-        results.append(("404 - Prompt Not Found", error_passed))
-
-    metrics = test_category_not_found()
-    if metrics:
-        metrics.endpoint_name = "error_handling"
-        metrics.print_report()
-        error_passed = any(code == 404 for code in metrics.status_codes)
-        results.append(("404 - Category Not Found", error_passed))
+    error_tests = [
+        (test_prompt_not_found, "404 - Prompt Not Found"),
+        (test_category_not_found, "404 - Category Not Found"),
+    ]
+    all_metrics = run_concurrently(*(test for test, _ in error_tests))
+
+    for metrics, (_, label) in zip(all_metrics, error_tests):
+        if metrics:
+            metrics.endpoint_name = "error_handling"
+            metrics.print_report()
+            error_passed = 404 in metrics.status_codes
+            results.append((label, error_passed))
 
     # Test content availability
     print_test_header("CONTENT AVAILABILITY")
@@ -1,15 +1,33 @@
 """
 Performance tests for Transcript Storage endpoints.
 """
-from config import BASE_URL, PERFORMANCE_ITERATIONS, TEST_VIDEOS, TEST_LANGUAGES, REQUEST_TIMEOUT
-from utils import make_request, measure_performance, print_test_header, Colors
-
-
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from config import (
+    BASE_URL, PERFORMANCE_ITERATIONS, TEST_VIDEOS, TEST_LANGUAGES, REQUEST_TIMEOUT,
+    OK_MARK, FAIL_MARK,
+)
+from utils import (
+    make_request, measure_performance, print_test_header, run_concurrently,
+    parse_json, json_body, discard_body, Colors, JSON_HEADERS,
+)
+
+# Endpoint URLs, built once at import
+_HEALTH_URL = f"{BASE_URL}/health"
+_SAVE_URL = f"{BASE_URL}/transcripts/save"
+_GET_URL = f"{BASE_URL}/transcripts/get"
+_LIST_URL = f"{BASE_URL}/transcripts/list"
+_STATS_URL = f"{BASE_URL}/transcripts/stats"
+_DELETE_URL = f"{BASE_URL}/transcripts/delete"
+
+
+@lru_cache(maxsize=1)
 def check_storage_available():
-    """Check if storage features are available."""
-    response, error = make_request("GET", f"{BASE_URL}/health")
+    """Check if storage features are available, probing the API only once per run."""
+    response, error = make_request("GET", _HEALTH_URL)
     if response and not error:
-        data = response.json()
+        data = parse_json(response)
         cache_status = data.get("cache_status", "")
         return "enabled" in cache_status
     return False
@@ -17,15 +35,17 @@ def check_storage_available():
 
 def test_transcript_save():
     """Test POST /transcripts/save endpoint."""
+    body = json_body({
+        "url": TEST_VIDEOS["short"],
+        "languages": TEST_LANGUAGES["primary"]
+    })
+
     def _test():
         return make_request(
             "POST",
-            f"{BASE_URL}/transcripts/save",
-            json={
-                "url": TEST_VIDEOS["short"],
-                "languages": TEST_LANGUAGES["primary"]
-            },
-            headers={"Content-Type": "application/json"},
+            _SAVE_URL,
+            data=body,
+            headers=JSON_HEADERS,
             timeout=REQUEST_TIMEOUT
         )
 
@@ -34,15 +54,17 @@ def test_transcript_save():
 
 def test_transcript_get():
     """Test POST /transcripts/get endpoint."""
+    body = json_body({
+        "url": TEST_VIDEOS["short"],
+        "languages": TEST_LANGUAGES["primary"]
+    })
+
     def _test():
         return make_request(
             "POST",
-            f"{BASE_URL}/transcripts/get",
-            json={
-                "url": TEST_VIDEOS["short"],
-                "languages": TEST_LANGUAGES["primary"]
-            },
-            headers={"Content-Type": "application/json"},
+            _GET_URL,
+            data=body,
+            headers=JSON_HEADERS,
             timeout=REQUEST_TIMEOUT
         )
 
@@ -54,7 +76,7 @@ def test_transcript_list():
     def _test():
         return make_request(
             "GET",
-            f"{BASE_URL}/transcripts/list",
+            _LIST_URL,
             timeout=REQUEST_TIMEOUT
         )
 
@@ -66,7 +88,7 @@ def test_transcript_stats():
     def _test():
         return make_request(
             "GET",
-            f"{BASE_URL}/transcripts/stats",
+            _STATS_URL,
             timeout=REQUEST_TIMEOUT
         )
 
@@ -75,65 +97,79 @@ def test_transcript_stats():
 
 def test_transcript_delete():
     """Test POST /transcripts/delete endpoint."""
+    body = json_body({
+        "url": TEST_VIDEOS["short"],
+        "languages": TEST_LANGUAGES["primary"]
+    })
+
     def _test():
         return make_request(
             "POST",
-            f"{BASE_URL}/transcripts/delete",
-            json={
-                "url": TEST_VIDEOS["short"],
-                "languages": TEST_LANGUAGES["primary"]
-            },
-            headers={"Content-Type": "application/json"},
+            _DELETE_URL,
+            data=body,
+            headers=JSON_HEADERS,
             timeout=REQUEST_TIMEOUT
         )
 
     return measure_performance(_test, 1)  # Delete only once
 
 
+def _run_workflow_step(step: tuple) -> tuple:
+    """Send one workflow request, returning (response, error)."""
+    _, method, url, body = step
+
+    kwargs = {
+        "timeout": REQUEST_TIMEOUT,
+        "headers": JSON_HEADERS
+    }
+
+    if body:
+        kwargs["data"] = body
+
+    return make_request(method, url, **kwargs)
+
+
 def test_storage_workflow():
-    """Test complete storage workflow: save -> get -> list -> delete."""
+    """Test complete storage workflow: save -> get -> list/stats -> delete."""
     print(f"\n{Colors.OKBLUE}Testing complete storage workflow...{Colors.ENDC}")
 
-    workflow_steps = [
-        ("Save", "POST", "/transcripts/save", {
-            "url": TEST_VIDEOS["medium"],
-            "languages": TEST_LANGUAGES["primary"]
-        }),
-        ("Get", "POST", "/transcripts/get", {
-            "url": TEST_VIDEOS["medium"],
-            "languages": TEST_LANGUAGES["primary"]
-        }),
-        ("List", "GET", "/transcripts/list", None),
-        ("Stats", "GET", "/transcripts/stats", None),
-        ("Delete", "POST", "/transcripts/delete", {
-            "url": TEST_VIDEOS["medium"],
-            "languages": TEST_LANGUAGES["primary"]
-        }),
+    body = json_body({
+        "url": TEST_VIDEOS["medium"],
+        "languages": TEST_LANGUAGES["primary"]
+    })
+
+    # Save, get and delete must run in order; list and stats only need the
+    # save to have landed, so they share a stage
+    workflow_stages = [
+        [("Save", "POST", _SAVE_URL, body)],
+        [("Get", "POST", _GET_URL, body)],
+        [
+            ("List", "GET", _LIST_URL, None),
+            ("Stats", "GET", _STATS_URL, None),
+        ],
+        [("Delete", "POST", _DELETE_URL, body)],
     ]
 
     all_passed = True
 
-    for step_name, method, endpoint, data in workflow_steps:
-        print(f"  {step_name}...", end=" ", flush=True)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        for stage in workflow_stages:
+            outcomes = executor.map(_run_workflow_step, stage)
 
-        kwargs = {
-            "timeout": REQUEST_TIMEOUT,
-            "headers": {"Content-Type": "application/json"}
-        }
+            # Report in step order once the whole stage has finished
+            for (step_name, *_), (response, error) in zip(stage, outcomes):
+                print(f"  {step_name}...", end=" ")
 
-        if data:
-            kwargs["json"] = data
+                if error:
+                    print(f"{FAIL_MARK}: {error}")
+                    all_passed = False
+                elif response is not None and response.status_code < 400:
+                    print(OK_MARK)
+                else:
+                    print(f"{FAIL_MARK}: HTTP {response.status_code if response is not None else 'N/A'}")
+                    all_passed = False
 
-        response, error = make_request(method, f"{BASE_URL}{endpoint}", **kwargs)
-
-        if error:
-            print(f"{Colors.FAIL}✗ FAILED{Colors.ENDC}: {error}")
-            all_passed = False
-        elif response and response.status_code < 400:
-            print(f"{Colors.OKGREEN}✓ OK{Colors.ENDC}")
-        else:
-            print(f"{Colors.FAIL}✗ FAILED{Colors.ENDC}: HTTP {response.status_code if response else 'N/A'}")
-            all_passed = False
+                discard_body(response)
 
     if all_passed:
         print(f"\n  {Colors.OKGREEN}✓ Workflow completed successfully{Colors.ENDC}")
@@ -165,23 +201,18 @@ def run_all_tests():
     passed = metrics.print_report()
     results.append(("POST /transcripts/save", passed))
 
-    # Test get
-    metrics = test_transcript_get()
-    metrics.endpoint_name = "storage_get"
-    passed = metrics.print_report()
-    results.append(("POST /transcripts/get", passed))
-
-    # Test list
-    metrics = test_transcript_list()
-    metrics.endpoint_name = "storage_list"
-    passed = metrics.print_report()
-    results.append(("GET /transcripts/list", passed))
+    # Save has run, so the reads can go side by side
+    independent_tests = [
+        (test_transcript_get, "storage_get", "POST /transcripts/get"),
+        (test_transcript_list, "storage_list", "GET /transcripts/list"),
+        (test_transcript_stats, "storage_stats", "GET /transcripts/stats"),
+    ]
+    all_metrics = run_concurrently(*(test for test, _, _ in independent_tests))
 
-    # Test stats
-    metrics = test_transcript_stats()
-    metrics.endpoint_name = "storage_stats"
-    passed = metrics.print_report()
-    results.append(("GET /transcripts/stats", passed))
+    for metrics, (_, endpoint_name, label) in zip(all_metrics, independent_tests):
+        metrics.endpoint_name = endpoint_name
+        passed = metrics.print_report()
+        results.append((label, passed))
 
     # Test delete
     metrics = test_transcript_delete()
@@ -1,19 +1,33 @@
 """
 Performance tests for Video Data & Transcript endpoints.
 """
-import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from config import BASE_URL, PERFORMANCE_ITERATIONS, TEST_VIDEOS, TEST_LANGUAGES, REQUEST_TIMEOUT
-from utils import make_request, measure_performance, print_test_header
+from utils import (
+    make_request, measure_performance, print_test_header, run_concurrently,
+    JSON_HEADERS, json_body, discard_body,
+)
+
+# Endpoint URLs, built once at import
+_VIDEO_DATA_URL = f"{BASE_URL}/video-data"
+_VIDEO_CAPTIONS_URL = f"{BASE_URL}/video-captions"
+_VIDEO_TIMESTAMPS_URL = f"{BASE_URL}/video-timestamps"
+_VIDEO_LANGUAGES_URL = f"{BASE_URL}/video-transcript-languages"
 
 
 def test_video_data():
     """Test POST /video-data endpoint."""
+    body = json_body({"url": TEST_VIDEOS["short"]})
+
     def _test():
         return make_request(
             "POST",
-            f"{BASE_URL}/video-data",
-            json={"url": TEST_VIDEOS["short"]},
-            headers={"Content-Type": "application/json"},
+            _VIDEO_DATA_URL,
+            data=body,
+            headers=JSON_HEADERS,
             timeout=REQUEST_TIMEOUT
         )
 
@@ -22,15 +36,17 @@ def test_video_data():
 
 def test_video_captions():
     """Test POST /video-captions endpoint."""
+    body = json_body({
+        "url": TEST_VIDEOS["short"],
+        "languages": TEST_LANGUAGES["primary"]
+    })
+
     def _test():
         return make_request(
             "POST",
-            f"{BASE_URL}/video-captions",
-            json={
-                "url": TEST_VIDEOS["short"],
-                "languages": TEST_LANGUAGES["primary"]
-            },
-            headers={"Content-Type": "application/json"},
+            _VIDEO_CAPTIONS_URL,
+            data=body,
+            headers=JSON_HEADERS,
             timeout=REQUEST_TIMEOUT
         )
 
@@ -39,15 +55,17 @@ def test_video_captions():
 
 def test_video_captions_fallback():
     """Test POST /video-captions with language fallback."""
+    body = json_body({
+        "url": TEST_VIDEOS["short"],
+        "languages": TEST_LANGUAGES["fallback"]
+    })
+
     def _test():
         return make_request(
             "POST",
-            f"{BASE_URL}/video-captions",
-            json={
-                "url": TEST_VIDEOS["short"],
-                "languages": TEST_LANGUAGES["fallback"]
-            },
-            headers={"Content-Type": "application/json"},
+            _VIDEO_CAPTIONS_URL,
+            data=body,
+            headers=JSON_HEADERS,
             timeout=REQUEST_TIMEOUT
         )
 
@@ -56,15 +74,17 @@ def test_video_captions_fallback():
 
 def test_video_timestamps():
     """Test POST /video-timestamps endpoint."""
+    body = json_body({
+        "url": TEST_VIDEOS["short"],
+        "languages": TEST_LANGUAGES["primary"]
+    })
+
     def _test():
         return make_request(
             "POST",
-            f"{BASE_URL}/video-timestamps",
-            json={
-                "url": TEST_VIDEOS["short"],
-                "languages": TEST_LANGUAGES["primary"]
-            },
-            headers={"Content-Type": "application/json"},
+            _VIDEO_TIMESTAMPS_URL,
+            data=body,
+            headers=JSON_HEADERS,
             timeout=REQUEST_TIMEOUT
         )
 
@@ -73,12 +93,14 @@ def test_video_timestamps():
 
 def test_video_transcript_languages():
     """Test POST /video-transcript-languages endpoint."""
+    body = json_body({"url": TEST_VIDEOS["short"]})
+
     def _test():
         return make_request(
             "POST",
-            f"{BASE_URL}/video-transcript-languages",
-            json={"url": TEST_VIDEOS["short"]},
-            headers={"Content-Type": "application/json"},
+            _VIDEO_LANGUAGES_URL,
+            data=body,
+            headers=JSON_HEADERS,
             timeout=REQUEST_TIMEOUT
         )
 
@@ -87,12 +109,14 @@ def test_video_transcript_languages():
 
 def test_invalid_url():
     """Test error handling with invalid URL."""
+    body = json_body({"url": "https://invalid-url.com"})
+
     def _test():
         return make_request(
             "POST",
-            f"{BASE_URL}/video-data",
-            json={"url": "https://invalid-url.com"},
-            headers={"Content-Type": "application/json"},
+            _VIDEO_DATA_URL,
+            data=body,
+            headers=JSON_HEADERS,
             timeout=REQUEST_TIMEOUT
         )
 
@@ -100,38 +124,42 @@ def test_invalid_url():
 
 
 def test_cache_effectiveness():
-    """Test cache effectiveness by making repeated requests."""
-    print("\n  Testing cache effectiveness (3 iterations)...")
+    """Test cache effectiveness by timing warm requests against a priming request."""
+    print("\n  Testing cache effectiveness (3 parallel samples)...")
 
-    times = []
+    body = json_body({"url": TEST_VIDEOS["short"]})
 
-    for i in range(3):
+    def _timed_request(_=None):
+        start_ns = time.perf_counter_ns()
         response, error = make_request(
             "POST",
-            f"{BASE_URL}/video-data",
-            json={"url": TEST_VIDEOS["short"]},
-            headers={"Content-Type": "application/json"},
+            _VIDEO_DATA_URL,
+            data=body,
+            headers=JSON_HEADERS,
             timeout=REQUEST_TIMEOUT
         )
+        if error is None:
+            discard_body(response)
+        return time.perf_counter_ns() - start_ns, response, error
+
+    # Prime the cache once; the timed samples only need it warm, so they
+    # can share the connection pool in parallel
+    prime_ns, response, error = _timed_request()
+    if not response or error:
+        print(f"    Priming request failed: {error}")
+        return
+
+    print(f"    Priming request: {prime_ns / 1e6:.3f}ms")
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        samples = list(executor.map(_timed_request, range(3)))
+
+    times = [elapsed_ns for elapsed_ns, _, _ in samples]
+    for i, elapsed_ns in enumerate(times):
+        print(f"    Parallel sample {i+1}: {elapsed_ns / 1e6:.3f}ms")
 
-        if response and not error:
-            import time
-            # Simple timing
-            start = time.time()
-            make_request(
-                "POST",
-                f"{BASE_URL}/video-data",
-                json={"url": TEST_VIDEOS["short"]},
-                headers={"Content-Type": "application/json"},
-                timeout=REQUEST_TIMEOUT
-            )
-            elapsed = time.time() - start
-            times.append(elapsed)
-            print(f"    Request {i+1}: {elapsed:.3f}s")
-
-    if len(times) >= 2:
-        improvement = ((times[0] - times[-1]) / times[0]) * 100
-        print(f"    Cache improvement: {improvement:.1f}%")
+    improvement = ((prime_ns - statistics.mean(times)) / prime_ns) * 100
+    print(f"    Cache improvement: {improvement:.1f}%")
 
 
 def run_all_tests():
@@ -140,35 +168,20 @@ def run_all_tests():
 
     results = []
 
-    # Test video data
-    metrics = test_video_data()
-    metrics.endpoint_name = "video_data"
-    passed = metrics.print_report()
-    results.append(("POST /video-data", passed))
-
-    # Test captions
-    metrics = test_video_captions()
-    metrics.endpoint_name = "video_captions"
-    passed = metrics.print_report()
-    results.append(("POST /video-captions", passed))
-
-    # Test captions with fallback
-    metrics = test_video_captions_fallback()
-    metrics.endpoint_name = "video_captions"
-    passed = metrics.print_report()
-    results.append(("POST /video-captions (fallback)", passed))
-
-    # Test timestamps
-    metrics = test_video_timestamps()
-    metrics.endpoint_name = "video_timestamps"
-    passed = metrics.print_report()
-    results.append(("POST /video-timestamps", passed))
-
-    # Test languages
-    metrics = test_video_transcript_languages()
-    metrics.endpoint_name = "video_languages"
-    passed = metrics.print_report()
-    results.append(("POST /video-transcript-languages", passed))
+    # These endpoints don't depend on each other, so run them side by side
+    independent_tests = [
+        (test_video_data, "video_data", "POST /video-data"),
+        (test_video_captions, "video_captions", "POST /video-captions"),
+        (test_video_captions_fallback, "video_captions", "POST /video-captions (fallback)"),
+        (test_video_timestamps, "video_timestamps", "POST /video-timestamps"),
+        (test_video_transcript_languages, "video_languages", "POST /video-transcript-languages"),
+    ]
+    all_metrics = run_concurrently(*(test for test, _, _ in independent_tests))
+
+    for metrics, (_, endpoint_name, label) in zip(all_metrics, independent_tests):
+        metrics.endpoint_name = endpoint_name
+        passed = metrics.print_report()
+        results.append((label, passed))
 
     # Test error handling
     print_test_header("ERROR HANDLING")
@@ -176,7 +189,7 @@ def run_all_tests():
     metrics.endpoint_name = "error_handling"
     metrics.print_report()
     # Error handling test - expect 400 status code
-    error_passed = any(code == 400 for code in metrics.status_codes)
+    error_passed = 400 in metrics.status_codes
     results.append(("Error Handling (Invalid URL)", error_passed))
 
     # Test cache effectiveness
@@ -1,8 +1,31 @@
 """Tests for Redis caching service."""
 
+import asyncio
+import hashlib
+
+import httpx
 import pytest
 
-from src.youtube_api.services.cache import RedisCache, get_cache
+from youtube_transcript_api import AgeRestricted, InvalidVideoId, IpBlocked
+
+from src.youtube_api.exceptions import (
+    InvalidURLError,
+    TranscriptNotFoundError,
+    UpstreamServiceError,
+    VideoNotFoundError,
+    VideoRestrictedError,
+)
+from src.youtube_api.services import youtube
+from src.youtube_api.services.storage import TranscriptStorage
+from src.youtube_api.services.transcript import _transcript_error
+from src.youtube_api.services.cache import (
+    RedisCache,
+    _negative_entry,
+    _raise_if_negative,
+    cached,
+    close_cache,
+    get_cache,
+)
 
 
 class TestRedisCache:
@@ -19,6 +42,13 @@ class TestRedisCache:
         cache2 = get_cache()
         assert cache1 is cache2
 
+    def test_close_cache_resets_singleton(self):
+        """Test close_cache drops the global instance so it can be recreated."""
+        cache1 = get_cache()
+        close_cache()
+        cache2 = get_cache()
+        assert cache1 is not cache2
+
     def test_cache_stats_structure(self, cache):
         """Test cache stats returns expected structure."""
         stats = cache.get_stats()
@@ -65,13 +95,212 @@ class TestRedisCache:
         retrieved = cache.get(test_key)
         assert retrieved is None
 
+    @pytest.mark.skipif(
+        not get_cache().enabled,
+        reason="Redis not configured",
+    )
+    def test_clear_all_removes_unindexed_keys(self, cache):
+        """Test the first clear also sweeps keys written before the index existed."""
+        legacy_key = "youtube_api:test:legacy"
+        cache.client.set(legacy_key, "{}", ex=60)
+        cache.client.delete(cache.INDEX_MIGRATED_KEY)
+
+        assert cache.clear_all() is True
+        assert cache.client.exists(legacy_key) == 0
+
     def test_get_nonexistent_key(self, cache):
         """Test getting a key that doesn't exist."""
         result = cache.get("youtube_api:nonexistent:key")
         assert result is None
 
+    def test_unreachable_redis_is_skipped_after_failure(self):
+        """Test a failed operation makes later calls skip Redis until the retry window."""
+        cache = RedisCache(redis_url="redis://127.0.0.1:1/0")
+        assert cache.enabled is True
+
+        assert cache.get("youtube_api:test:unreachable") is None
+        assert cache.is_available() is False
+
+        class ExplodingClient:
+            def get(self, key):
+                raise AssertionError("Redis should not be contacted during backoff")
+
+        cache.client = ExplodingClient()
+        assert cache.get("youtube_api:test:unreachable") is None
+
+    def test_ping_reports_unreachable_redis(self):
+        """Test ping fails for an unreachable server and starts the backoff."""
+        cache = RedisCache(redis_url="redis://127.0.0.1:1/0")
+
+        assert cache.ping() is False
+        assert cache.is_available() is False
+
+    def test_storage_shares_cache_backoff(self):
+        """Test storage skips Redis while the cache is backing off after a failure."""
+        cache = RedisCache(redis_url="redis://127.0.0.1:1/0")
+        storage = TranscriptStorage()
+        storage.cache = cache
+        storage.enabled = True
+
+        assert storage.save_transcript("abc123", "text", "en") is False
+        assert storage.is_available() is False
+
+        class ExplodingClient:
+            def __getattr__(self, name):
+                raise AssertionError("Redis should not be contacted during backoff")
+
+        cache.client = cache._raw_client = ExplodingClient()
+        assert storage.get_transcript("abc123") is None
+        assert storage.list_stored_videos() == []
+
+    @pytest.mark.skipif(
+        not get_cache().enabled,
+        reason="Redis not configured",
+    )
+    def test_storage_save_ignores_stale_local_metadata(self):
+        """Test a save keeps languages added by another worker since it last read metadata."""
+        worker_a, worker_b = TranscriptStorage(), TranscriptStorage()
+        video_id = "pytest_stale_metadata"
+
+        worker_a.save_transcript(video_id, "hello", "en")
+        worker_b.save_transcript(video_id, "hallo", "de")
+        worker_a.save_transcript(video_id, "bonjour", "fr")
+
+        assert TranscriptStorage().get_metadata(video_id)["languages"] == ["en", "de", "fr"]
+        worker_a.delete_transcript(video_id)
+
     def test_generate_key(self, cache):
         """Test cache key generation."""
         key = cache._generate_key("test", "arg1", "arg2", kwarg1="val1")
         assert key.startswith("youtube_api:test:")
         assert len(key) > len("youtube_api:test:")
+
+    def test_generate_key_matches_joined_digest(self, cache):
+        """Test incremental key hashing matches hashing the joined arguments."""
+        expected = hashlib.md5(b"arg1:arg2:kwarg1=val1").hexdigest()
+        key = cache._generate_key("test", "arg1", "arg2", kwarg1="val1")
+        assert key == f"youtube_api:test:{expected}"
+
+
+class TestCachedDecorator:
+    """Test cases for the cached decorator."""
+
+    async def test_concurrent_misses_are_coalesced(self):
+        """Test concurrent calls with the same arguments share one execution."""
+        calls = 0
+
+        @cached(prefix="test_coalesce", ttl=60)
+        async def slow_lookup(value: str) -> dict:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"value": value}
+
+        results = await asyncio.gather(*(slow_lookup("coalesce-me") for _ in range(5)))
+
+        assert calls == 1
+        assert all(r == {"value": "coalesce-me"} for r in results)
+        get_cache().delete(get_cache()._generate_key("test_coalesce", "coalesce-me"))
+
+    async def test_coalesced_callers_share_exception(self):
+        """Test waiters receive the exception raised by the in-flight call."""
+
+        @cached(prefix="test_coalesce_error", ttl=60)
+        async def failing_lookup(value: str) -> dict:
+            await asyncio.sleep(0.01)
+            raise ValueError(value)
+
+        results = await asyncio.gather(
+            *(failing_lookup("boom") for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+    async def test_waiters_survive_cancelled_leader(self):
+        """Test cancelling the computing caller makes waiters retry instead of cancelling them."""
+        calls = 0
+
+        @cached(prefix="test_coalesce_cancel", ttl=60)
+        async def slow_lookup(value: str) -> dict:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return {"value": value}
+
+        leader = asyncio.create_task(slow_lookup("cancel-me"))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.create_task(slow_lookup("cancel-me"))
+        await asyncio.sleep(0.01)
+
+        leader.cancel()
+        result = await waiter
+
+        assert leader.cancelled()
+        assert result == {"value": "cancel-me"}
+        assert calls == 2
+        get_cache().delete(get_cache()._generate_key("test_coalesce_cancel", "cancel-me"))
+
+    def test_negative_entry_reraises_original_error(self):
+        """Test a cached failure is re-raised as the original exception type."""
+        entry = _negative_entry(VideoNotFoundError("abc123"))
+
+        with pytest.raises(VideoNotFoundError) as exc_info:
+            _raise_if_negative(entry, (VideoNotFoundError, TranscriptNotFoundError))
+
+        assert exc_info.value.status_code == 404
+        assert exc_info.value.message == "Video not found: abc123"
+
+    def test_regular_values_are_not_treated_as_negative(self):
+        """Test normal cached values pass through untouched."""
+        _raise_if_negative({"title": "Test"}, (VideoNotFoundError,))
+        _raise_if_negative(["a", "b"], (VideoNotFoundError,))
+
+    async def test_transient_upstream_errors_are_not_negative_cached(self, monkeypatch):
+        """Test a timeout surfaces as a 502 instead of a cached 404."""
+        stored = []
+        monkeypatch.setattr(get_cache(), "get", lambda key: None)
+        monkeypatch.setattr(get_cache(), "set", lambda key, value, ttl=None: stored.append(value))
+
+        class TimingOutClient:
+            async def get(self, url):
+                raise httpx.ConnectTimeout("timed out")
+
+        async def get_client():
+            return TimingOutClient()
+
+        monkeypatch.setattr(youtube, "get_http_client", get_client)
+
+        with pytest.raises(UpstreamServiceError) as exc_info:
+            await youtube.YouTubeService.get_video_data("dQw4w9WgXcQ")
+
+        assert exc_info.value.status_code == 502
+        assert stored == []
+
+    async def test_not_found_errors_are_negative_cached(self, monkeypatch):
+        """Test a real 404 is stored as a negative cache entry."""
+        stored = []
+        monkeypatch.setattr(get_cache(), "get", lambda key: None)
+        monkeypatch.setattr(get_cache(), "set", lambda key, value, ttl=None: stored.append(value))
+
+        @cached(prefix="test_negative", negative_cache=(VideoNotFoundError,))
+        async def missing_video(video_id: str) -> dict:
+            raise VideoNotFoundError(video_id)
+
+        with pytest.raises(VideoNotFoundError):
+            await missing_video("abc123")
+
+        assert stored == [_negative_entry(VideoNotFoundError("abc123"))]
+
+    @pytest.mark.parametrize(
+        "error,expected_type,status_code",
+        [
+            (InvalidVideoId("abc123"), InvalidURLError, 400),
+            (AgeRestricted("abc123"), VideoRestrictedError, 403),
+            (IpBlocked("abc123"), UpstreamServiceError, 503),
+        ],
+    )
+    def test_transcript_errors_map_to_status(self, error, expected_type, status_code):
+        """Test permanent request problems become client errors, not retryable 5xx."""
+        mapped = _transcript_error(error, "abc123")
+        assert isinstance(mapped, expected_type)
+        assert mapped.status_code == status_code
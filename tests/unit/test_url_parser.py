@@ -2,110 +2,63 @@
 
 import pytest
 
-from src.youtube_api.utils.url_parser import get_youtube_video_id
+from src.youtube_api.utils.url_parser import (
+    MAX_MEMOIZED_LENGTH,
+    _memoized_video_id,
+    get_youtube_video_id,
+)
 
 
 class TestGetYoutubeVideoId:
     """Test cases for get_youtube_video_id function."""
 
-    # Direct video ID
-    def test_direct_video_id(self):
-        """Test parsing direct video ID."""
-        assert get_youtube_video_id("dQw4w9WgXcQ") == "dQw4w9WgXcQ"
-
-    # Standard watch URLs
-    @pytest.mark.parametrize(
-        "url,expected",
-        [
-            ("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
-            ("https://youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
-            ("http://www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
-        ],
-    )
-    def test_standard_watch_urls(self, url, expected):
-        """Test standard YouTube watch URLs."""
-        assert get_youtube_video_id(url) == expected
-
-    # Short URLs (youtu.be)
-    @pytest.mark.parametrize(
-        "url,expected",
-        [
-            ("https://youtu.be/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
-            ("http://youtu.be/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
-            ("youtu.be/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
-        ],
-    )
-    def test_short_urls(self, url, expected):
-        """Test youtu.be short URLs."""
-        assert get_youtube_video_id(url) == expected
-
-    # URLs with query parameters
-    @pytest.mark.parametrize(
-        "url,expected",
-        [
-            ("https://youtu.be/dQw4w9WgXcQ?t=123", "dQw4w9WgXcQ"),
-            ("https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PLtest", "dQw4w9WgXcQ"),
-            ("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=42s", "dQw4w9WgXcQ"),
-        ],
-    )
-    def test_urls_with_params(self, url, expected):
-        """Test URLs with additional query parameters."""
-        assert get_youtube_video_id(url) == expected
-
-    # Embed URLs
+    # Every supported URL shape, in one table
     @pytest.mark.parametrize(
         "url,expected",
         [
-            ("https://www.youtube.com/embed/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
-            ("https://www.youtube.com/embed/dQw4w9WgXcQ?autoplay=1", "dQw4w9WgXcQ"),
+            pytest.param("dQw4w9WgXcQ", "dQw4w9WgXcQ", id="direct-id"),
+            pytest.param("https://www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ", id="watch-https-www"),
+            pytest.param("https://youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ", id="watch-https"),
+            pytest.param("http://www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ", id="watch-http-www"),
+            pytest.param("https://youtu.be/dQw4w9WgXcQ", "dQw4w9WgXcQ", id="short-https"),
+            pytest.param("http://youtu.be/dQw4w9WgXcQ", "dQw4w9WgXcQ", id="short-http"),
+            pytest.param("youtu.be/dQw4w9WgXcQ", "dQw4w9WgXcQ", id="short-no-scheme"),
+            pytest.param("https://youtu.be/dQw4w9WgXcQ?t=123", "dQw4w9WgXcQ", id="short-timestamp"),
+            pytest.param("https://www.youtube.com/watch?v=dQw4w9WgXcQ&list=PLtest", "dQw4w9WgXcQ", id="watch-playlist"),
+            pytest.param("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=42s", "dQw4w9WgXcQ", id="watch-timestamp"),
+            pytest.param("https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ", "dQw4w9WgXcQ", id="watch-v-not-first"),
+            pytest.param("https://www.youtube.com/watch?v=dQw4w9WgXcQ&v=aaaaaaaaaaa", "dQw4w9WgXcQ", id="watch-repeated-v"),
+            pytest.param("https://www.youtube.com/embed/dQw4w9WgXcQ", "dQw4w9WgXcQ", id="embed"),
+            pytest.param("https://www.youtube.com/embed/dQw4w9WgXcQ?autoplay=1", "dQw4w9WgXcQ", id="embed-params"),
+            pytest.param("https://www.youtube.com/v/dQw4w9WgXcQ", "dQw4w9WgXcQ", id="old-v"),
+            pytest.param("https://www.youtube.com/shorts/dQw4w9WgXcQ", "dQw4w9WgXcQ", id="shorts-www"),
+            pytest.param("https://youtube.com/shorts/dQw4w9WgXcQ", "dQw4w9WgXcQ", id="shorts"),
+            pytest.param("https://www.youtube.com/live/dQw4w9WgXcQ", "dQw4w9WgXcQ", id="live"),
+            pytest.param("https://m.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ", id="mobile"),
+            pytest.param("https://music.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ", id="music"),
+            pytest.param("www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ", id="watch-no-scheme-www"),
+            pytest.param("youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ", id="watch-no-scheme"),
         ],
     )
-    def test_embed_urls(self, url, expected):
-        """Test embed URLs."""
+    def test_valid_urls(self, url, expected):
+        """Test every supported URL shape resolves to its video ID."""
         assert get_youtube_video_id(url) == expected
 
-    # Old /v/ format
-    def test_old_v_format(self):
-        """Test old /v/ format URL."""
-        assert get_youtube_video_id("https://www.youtube.com/v/dQw4w9WgXcQ") == "dQw4w9WgXcQ"
-
-    # Shorts URLs
+    # Shapes only handled by the urlparse fallback
     @pytest.mark.parametrize(
         "url,expected",
         [
-            ("https://www.youtube.com/shorts/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
-            ("https://youtube.com/shorts/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+            ("https://YouTu.be/dQw4w9WgXcQ?t=1", "dQw4w9WgXcQ"),
+            ("https://YouTube.com/embed/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+            ("https://youtube.com:443/shorts/dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+            ("https://YouTube.com/shorts/abc", None),
+            ("https://YouTube.com/watch?v=not-an-id", None),
+            ("https://YouTu.be/dQw4w9WgXcQextra", None),
+            ("https://youtu.be/dQw4w9WgXcQextra", None),
         ],
     )
-    def test_shorts_urls(self, url, expected):
-        """Test YouTube Shorts URLs."""
-        assert get_youtube_video_id(url) == expected
-
-    # Live URLs
-    def test_live_url(self):
-        """Test YouTube Live URL."""
-        assert get_youtube_video_id("https://www.youtube.com/live/dQw4w9WgXcQ") == "dQw4w9WgXcQ"
-
-    # Mobile URLs
-    def test_mobile_url(self):
-        """Test mobile YouTube URL."""
-        assert get_youtube_video_id("https://m.youtube.com/watch?v=dQw4w9WgXcQ") == "dQw4w9WgXcQ"
-
-    # YouTube Music
-    def test_music_url(self):
-        """Test YouTube Music URL."""
-        assert get_youtube_video_id("https://music.youtube.com/watch?v=dQw4w9WgXcQ") == "dQw4w9WgXcQ"
-
-    # URLs without protocol
-    @pytest.mark.parametrize(
-        "url,expected",
-        [
-            ("www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
-            ("youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
-        ],
-    )
-    def test_urls_without_protocol(self, url, expected):
-        """Test URLs without protocol prefix."""
+    def test_fallback_urls(self, url, expected):
+        """Test URLs that miss the regex fast path."""
         assert get_youtube_video_id(url) == expected
 
     # Invalid inputs
@@ -116,8 +69,24 @@ class TestGetYoutubeVideoId:
             "invalid",
             "https://example.com/watch?v=test",
             "not_a_video_id_too_long",
+            "dQw4w9WgX!Q",
         ],
     )
     def test_invalid_inputs(self, url):
         """Test invalid URL inputs return None."""
         assert get_youtube_video_id(url) is None
+
+    def test_results_are_memoized(self):
+        """Test repeated lookups of the same URL are served from the cache."""
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ&memo=1"
+        get_youtube_video_id(url)
+        hits = _memoized_video_id.cache_info().hits
+        assert get_youtube_video_id(url) == "dQw4w9WgXcQ"
+        assert _memoized_video_id.cache_info().hits == hits + 1
+
+    def test_oversized_inputs_are_not_memoized(self):
+        """Test inputs longer than a URL are parsed without entering the cache."""
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ&pad=" + "x" * MAX_MEMOIZED_LENGTH
+        size = _memoized_video_id.cache_info().currsize
+        assert get_youtube_video_id(url) == "dQw4w9WgXcQ"
+        assert _memoized_video_id.cache_info().currsize == size
@@ -1,50 +1,163 @@
 """
 Utility functions for performance testing.
 """
+import atexit
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import math
+import random
+import sys
+import threading
 import time
-import statistics
-from typing import Dict, List, Callable, Any
+from typing import Dict, List, Callable, Any, Optional
+import msgspec
 import requests
-from config import Colors, PERFORMANCE_THRESHOLDS
+from requests.adapters import HTTPAdapter
+from config import (
+    Colors, PERFORMANCE_THRESHOLDS, CONCURRENT_TESTS, ITERATION_CONCURRENCY,
+    ITERATION_RATE, ITERATION_BURST, PASS_LABEL, FAIL_LABEL,
+    BANNER, HEADER_STYLE, BANNER_LINE,
+)
+
+# Samples kept for the median; past this, reservoir sampling keeps a uniform
+# subset so long soak runs use bounded memory
+MEDIAN_RESERVOIR_SIZE = 10_000
+
+# Error messages kept for the report; later ones are only counted
+MAX_STORED_ERRORS = 100
+
+# Shared session so iterations reuse pooled keep-alive connections instead of
+# opening a new TCP (and TLS) connection per request
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(pool_connections=20, pool_maxsize=100, max_retries=0)
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+atexit.register(_SESSION.close)
+
+# Whether output goes to a terminal rather than a captured log
+_TTY = sys.stdout.isatty()
+
+# Headers for requests whose body is already serialized JSON
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Error bodies are only decoded for their detail message up to this size
+ERROR_DETAIL_MAX_BYTES = 8192
+
+# Chunk size for draining response bodies nobody reads
+BODY_CHUNK_SIZE = 64 * 1024
+
+_JSON_ENCODER = msgspec.json.Encoder()
+_JSON_DECODER = msgspec.json.Decoder()
+
+
+def json_body(payload: Any) -> bytes:
+    """Serialize a request body once, to send with data= and JSON_HEADERS."""
+    return _JSON_ENCODER.encode(payload)
+
+
+def parse_json(response: requests.Response) -> Any:
+    """Decode a response body with msgspec, which is faster than response.json()."""
+    return _JSON_DECODER.decode(response.content)
 
 
 class PerformanceMetrics:
     """Track and display performance metrics for API tests."""
 
+    __slots__ = (
+        "_endpoint_name",
+        "threshold",
+        "response_times",
+        "status_codes",
+        "errors",
+        "success_count",
+        "failure_count",
+        "_count",
+        "_mean",
+        "_m2",
+        "_min",
+        "_max",
+    )
+
     def __init__(self, endpoint_name: str):
         self.endpoint_name = endpoint_name
-        self.response_times: List[float] = []
-        self.status_codes: List[int] = []
+        # Typed buffer holds raw doubles rather than a boxed float per sample
+        self.response_times = array("d")
+        # Tally per status code; stays a handful of entries however long the run
+        self.status_codes: Counter = Counter()
+        # Capped so a failing soak run doesn't pile up error strings;
+        # failure_count keeps the true total
         self.errors: List[str] = []
         self.success_count = 0
         self.failure_count = 0
 
+        # Running response time statistics (Welford's algorithm)
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = math.inf
+        self._max = -math.inf
+
+    @property
+    def endpoint_name(self) -> str:
+        """Endpoint this metrics object reports on."""
+        return self._endpoint_name
+
+    @endpoint_name.setter
+    def endpoint_name(self, name: str):
+        # Suites rename metrics after measuring, so the threshold is resolved
+        # whenever the name changes rather than on every report
+        self._endpoint_name = name
+        self.threshold = PERFORMANCE_THRESHOLDS.get(name, 1.0)
+
     def add_result(self, response_time: float, status_code: int, error: str = None):
         """Add a test result."""
-        self.response_times.append(response_time)
-        self.status_codes.append(status_code)
+        self._count += 1
+        delta = response_time - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (response_time - self._mean)
+        if response_time < self._min:
+            self._min = response_time
+        if response_time > self._max:
+            self._max = response_time
+
+        if len(self.response_times) < MEDIAN_RESERVOIR_SIZE:
+            self.response_times.append(response_time)
+        else:
+            slot = random.randrange(self._count)
+            if slot < MEDIAN_RESERVOIR_SIZE:
+                self.response_times[slot] = response_time
+
+        self.status_codes[status_code] += 1
 
         if error:
-            self.errors.append(error)
+            if len(self.errors) < MAX_STORED_ERRORS:
+                self.errors.append(error)
             self.failure_count += 1
         else:
             self.success_count += 1
 
     def get_stats(self) -> Dict[str, Any]:
         """Calculate statistics from collected metrics."""
-        if not self.response_times:
+        count = self._count
+        if not count:
             return {}
 
+        # Everything but the median comes from the running totals; the median
+        # is exact until the reservoir fills, then an estimate from it
+        times = sorted(self.response_times)
+        middle = len(times) // 2
+
         return {
-            "min": min(self.response_times),
-            "max": max(self.response_times),
-            "mean": statistics.mean(self.response_times),
-            "median": statistics.median(self.response_times),
-            "stdev": statistics.stdev(self.response_times) if len(self.response_times) > 1 else 0,
-            "total_requests": len(self.response_times),
+            "min": self._min,
+            "max": self._max,
+            "mean": self._mean,
+            "median": times[middle] if len(times) % 2 else (times[middle - 1] + times[middle]) / 2,
+            "stdev": math.sqrt(self._m2 / (count - 1)) if count > 1 else 0,
+            "total_requests": count,
             "success_count": self.success_count,
             "failure_count": self.failure_count,
-            "success_rate": (self.success_count / len(self.response_times)) * 100,
+            "success_rate": (self.success_count / count) * 100,
         }
 
     def print_report(self):
@@ -55,130 +168,283 @@ class PerformanceMetrics:
             print(f"{Colors.WARNING}No data collected for {self.endpoint_name}{Colors.ENDC}")
             return
 
-        threshold = PERFORMANCE_THRESHOLDS.get(self.endpoint_name, 1.0)
+        threshold = self.threshold
         passed = stats["mean"] <= threshold
 
-        print(f"\n{Colors.BOLD}{Colors.HEADER}{'='*70}{Colors.ENDC}")
-        print(f"{Colors.BOLD}Performance Report: {self.endpoint_name}{Colors.ENDC}")
-        print(f"{Colors.BOLD}{Colors.HEADER}{'='*70}{Colors.ENDC}")
-
-        # Response times
-        print(f"\n{Colors.OKCYAN}Response Times (seconds):{Colors.ENDC}")
-        print(f"  Min:     {stats['min']:.3f}s")
-        print(f"  Max:     {stats['max']:.3f}s")
-        print(f"  Mean:    {stats['mean']:.3f}s")
-        print(f"  Median:  {stats['median']:.3f}s")
-        print(f"  StdDev:  {stats['stdev']:.3f}s")
-
-        # Throughput
-        print(f"\n{Colors.OKCYAN}Throughput:{Colors.ENDC}")
-        print(f"  Requests/sec: {1/stats['mean']:.2f}")
-
-        # Success rate
-        print(f"\n{Colors.OKCYAN}Reliability:{Colors.ENDC}")
-        print(f"  Total Requests:  {stats['total_requests']}")
-        print(f"  Successful:      {stats['success_count']}")
-        print(f"  Failed:          {stats['failure_count']}")
-        print(f"  Success Rate:    {stats['success_rate']:.1f}%")
-
-        # Status codes
-        status_counts = {}
-        for code in self.status_codes:
-            status_counts[code] = status_counts.get(code, 0) + 1
-
-        print(f"\n{Colors.OKCYAN}Status Codes:{Colors.ENDC}")
-        for code, count in sorted(status_counts.items()):
-            print(f"  {code}: {count}")
+        # Build the whole report and write it once, so reports from
+        # concurrent tests can't interleave line by line
+        cyan, endc = Colors.OKCYAN, Colors.ENDC
+        lines = [
+            f"\n{BANNER_LINE}",
+            f"{Colors.BOLD}Performance Report: {self.endpoint_name}{endc}",
+            BANNER_LINE,
+
+            # Response times
+            f"\n{cyan}Response Times (seconds):{endc}",
+            f"  Min:     {stats['min']:.3f}s",
+            f"  Max:     {stats['max']:.3f}s",
+            f"  Mean:    {stats['mean']:.3f}s",
+            f"  Median:  {stats['median']:.3f}s",
+            f"  StdDev:  {stats['stdev']:.3f}s",
+
+            # Throughput
+            f"\n{cyan}Throughput:{endc}",
+            f"  Requests/sec: {1/stats['mean']:.2f}",
+
+            # Success rate
+            f"\n{cyan}Reliability:{endc}",
+            f"  Total Requests:  {stats['total_requests']}",
+            f"  Successful:      {stats['success_count']}",
+            f"  Failed:          {stats['failure_count']}",
+            f"  Success Rate:    {stats['success_rate']:.1f}%",
+
+            # Status codes
+            f"\n{cyan}Status Codes:{endc}",
+        ]
+        lines.extend(f"  {code}: {count}" for code, count in sorted(self.status_codes.items()))
 
         # Errors
         if self.errors:
-            print(f"\n{Colors.WARNING}Errors:{Colors.ENDC}")
-            for error in self.errors[:5]:  # Show first 5 errors
-                print(f"  - {error}")
-            if len(self.errors) > 5:
-                print(f"  ... and {len(self.errors) - 5} more")
+            lines.append(f"\n{Colors.WARNING}Errors:{endc}")
+            lines.extend(f"  - {error}" for error in self.errors[:5])  # Show first 5 errors
+            if self.failure_count > 5:
+                lines.append(f"  ... and {self.failure_count - 5} more")
 
         # Performance threshold check
-        print(f"\n{Colors.OKCYAN}Performance Threshold:{Colors.ENDC}")
-        print(f"  Expected:  ≤ {threshold:.3f}s")
-        print(f"  Actual:    {stats['mean']:.3f}s")
+        lines.append(f"\n{cyan}Performance Threshold:{endc}")
+        lines.append(f"  Expected:  ≤ {threshold:.3f}s")
+        lines.append(f"  Actual:    {stats['mean']:.3f}s")
 
         if passed:
-            print(f"  {Colors.OKGREEN}✓ PASSED{Colors.ENDC}")
+            lines.append(f"  {Colors.OKGREEN}✓ PASSED{endc}")
         else:
-            print(f"  {Colors.FAIL}✗ FAILED{Colors.ENDC}")
+            lines.append(f"  {Colors.FAIL}✗ FAILED{endc}")
 
-        print(f"{Colors.BOLD}{Colors.HEADER}{'='*70}{Colors.ENDC}\n")
+        lines.append(f"{BANNER_LINE}\n")
+        sys.stdout.write("\n".join(lines) + "\n")
 
         return passed
 
 
-def measure_performance(func: Callable, iterations: int = 5) -> PerformanceMetrics:
+def _timed_call(func: Callable) -> tuple:
+    """Run one test iteration, returning (response_time, response, error, exception)."""
+    # Monotonic integer nanoseconds, so sub-millisecond cached responses
+    # aren't lost to time.time() resolution
+    start_ns = time.perf_counter_ns()
+    try:
+        response, error = func()
+        # The full body is part of the response time, but it's read and
+        # dropped rather than buffered
+        if error is None:
+            discard_body(response)
+        return (time.perf_counter_ns() - start_ns) / 1e9, response, error, None
+    except Exception as e:
+        return (time.perf_counter_ns() - start_ns) / 1e9, None, None, e
+
+
+def _show_progress() -> bool:
+    """Per-iteration progress is only printed from the main thread, where it can't interleave."""
+    return threading.current_thread() is threading.main_thread()
+
+
+def _record_result(metrics: PerformanceMetrics, outcome: tuple, verbose: bool = True):
+    """Add one iteration outcome to metrics and print its status."""
+    response_time, response, error, exception = outcome
+
+    if exception is not None:
+        metrics.add_result(response_time, 0, str(exception))
+        if verbose:
+            print(f"{Colors.FAIL}EXCEPTION{Colors.ENDC} ({response_time:.3f}s): {exception}")
+        return
+
+    # Responses are falsy for 4xx/5xx, so test for None rather than truthiness
+    status_code = response.status_code if response is not None else 0
+
+    metrics.add_result(response_time, status_code, error)
+
+    if not verbose:
+        return
+
+    if error:
+        print(f"{Colors.WARNING}ERROR{Colors.ENDC} ({response_time:.3f}s)")
+    else:
+        print(f"{Colors.OKGREEN}OK{Colors.ENDC} ({response_time:.3f}s)")
+
+
+class TokenBucket:
+    """Rate limiter allowing `burst` calls at once, then `rate` calls per second."""
+
+    __slots__ = ("rate", "capacity", "_tokens", "_last_refill")
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._last_refill = time.perf_counter()
+
+    def acquire(self):
+        """Take a token, sleeping only if the bucket is empty."""
+        now = time.perf_counter()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+        if self._tokens < 1:
+            time.sleep((1 - self._tokens) / self.rate)
+            self._tokens = 0.0
+            self._last_refill = time.perf_counter()
+        else:
+            self._tokens -= 1
+
+
+def measure_performance(
+    func: Callable,
+    iterations: int = 5,
+    concurrency: int = ITERATION_CONCURRENCY,
+    rate_per_sec: Optional[float] = ITERATION_RATE,
+    burst: int = ITERATION_BURST,
+) -> PerformanceMetrics:
     """
     Measure performance of a function over multiple iterations.
 
     Args:
         func: Function to test (should return (response, error))
         iterations: Number of times to run the test
+        concurrency: Worker threads running iterations at once (1 runs them serially)
+        rate_per_sec: Most serial iterations per second (None or 0 for no limit)
+        burst: Serial iterations allowed back to back before the rate applies
 
     Returns:
         PerformanceMetrics object with collected data
     """
     metrics = PerformanceMetrics(func.__name__)
+    verbose = _show_progress()
+    # Per-iteration lines are only worth their writes on a terminal; captured
+    # CI logs get a single summary line per test instead
+    progress = verbose and _TTY
+
+    if verbose:
+        print(f"\n{Colors.OKBLUE}Testing {func.__name__}...{Colors.ENDC}")
+
+    if concurrency > 1 and iterations > 1:
+        # Iterations are independent, so their network waits can overlap;
+        # the worker threads share the pooled session
+        with ThreadPoolExecutor(max_workers=min(concurrency, iterations)) as executor:
+            futures = [executor.submit(_timed_call, func) for _ in range(iterations)]
+            for i, future in enumerate(as_completed(futures)):
+                if progress:
+                    print(f"  Iteration {i+1}/{iterations}...", end=" ")
+                _record_result(metrics, future.result(), progress)
+    else:
+        # Only wait when requests outpace the rate limit, so slow endpoints
+        # are not paused on top of their own response time
+        bucket = TokenBucket(rate_per_sec, burst) if rate_per_sec else None
+
+        for i in range(iterations):
+            if bucket:
+                bucket.acquire()
+            if progress:
+                print(f"  Iteration {i+1}/{iterations}...", end=" ", flush=True)
+            _record_result(metrics, _timed_call(func), progress)
+
+    if verbose and not progress:
+        print(f"  Done {iterations} iterations: {metrics.success_count} ok, "
+              f"{metrics.failure_count} errors")
 
-    print(f"\n{Colors.OKBLUE}Testing {func.__name__}...{Colors.ENDC}")
+    return metrics
 
-    for i in range(iterations):
-        print(f"  Iteration {i+1}/{iterations}...", end=" ", flush=True)
 
-        start_time = time.time()
-        try:
-            response, error = func()
-            response_time = time.time() - start_time
+def run_concurrently(*tests: Callable) -> List[Any]:
+    """
+    Run independent test functions at the same time.
 
-            if response:
-                status_code = response.status_code
-            else:
-                status_code = 0
+    Each test still times its own requests, so only the waits on different
+    endpoints overlap. Per-iteration progress is suppressed while tests run
+    side by side; callers print the reports afterwards.
 
-            metrics.add_result(response_time, status_code, error)
+    Args:
+        *tests: Zero-argument test functions
 
-            if error:
-                print(f"{Colors.WARNING}ERROR{Colors.ENDC} ({response_time:.3f}s)")
-            else:
-                print(f"{Colors.OKGREEN}OK{Colors.ENDC} ({response_time:.3f}s)")
+    Returns:
+        Each test's return value, in the order the tests were given
+    """
+    if not CONCURRENT_TESTS or len(tests) < 2:
+        return [test() for test in tests]
 
-        except Exception as e:
-            response_time = time.time() - start_time
-            metrics.add_result(response_time, 0, str(e))
-            print(f"{Colors.FAIL}EXCEPTION{Colors.ENDC} ({response_time:.3f}s): {e}")
+    names = ", ".join(test.__name__ for test in tests)
+    print(f"\n{Colors.OKBLUE}Running concurrently: {names}...{Colors.ENDC}")
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        return list(executor.map(lambda test: test(), tests))
 
-        # Small delay between requests to avoid rate limiting
-        if i < iterations - 1:
-            time.sleep(0.5)
 
-    return metrics
+def discard_body(response: Optional[requests.Response]):
+    """
+    Read and drop the rest of a response body without buffering it.
 
+    Draining (rather than just closing) a streamed response lets its
+    keep-alive connection go back to the pool for the next request.
+    Safe to call on a response that was already drained, such as the
+    error responses make_request returns.
+    """
+    if response is None:
+        return
+    try:
+        for _ in response.iter_content(BODY_CHUNK_SIZE):
+            pass
+    except requests.exceptions.StreamConsumedError:
+        pass
+    response.close()
 
-def make_request(method: str, url: str, **kwargs) -> tuple:
+
+def _error_message(response: requests.Response) -> str:
+    """Describe an error response, adding the API's detail message when it's cheap to read."""
+    error_msg = f"HTTP {response.status_code}"
+
+    # HTML error pages from proxies and oversized bodies aren't worth decoding
+    if "json" not in response.headers.get("content-type", ""):
+        return error_msg
+
+    try:
+        body = response.raw.read(ERROR_DETAIL_MAX_BYTES, decode_content=True)
+        error_detail = _JSON_DECODER.decode(body).get("detail", "")
+    except (msgspec.DecodeError, AttributeError):
+        return error_msg
+
+    if error_detail:
+        error_msg += f": {error_detail}"
+    return error_msg
+
+
+def make_request(
+    method: str, url: str, session: Optional[requests.Session] = None, **kwargs
+) -> tuple:
     """
     Make an HTTP request and return response and error.
 
+    Responses are streamed: the body is only downloaded when a caller reads
+    it (response.content, parse_json, ...). Callers that don't read a
+    successful response's body should pass it to discard_body() so its
+    connection is reused; measure_performance does this for test iterations.
+    Error responses are drained and closed here after their detail is read.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        session: Session to send the request on (defaults to the shared pooled session)
+        **kwargs: Passed through to requests
+
     Returns:
         tuple: (response, error_message)
     """
+    kwargs.setdefault("stream", True)
+
     try:
-        response = requests.request(method, url, **kwargs)
+        response = (session or _SESSION).request(method, url, **kwargs)
 
         # Check for HTTP errors
         if response.status_code >= 400:
-            error_msg = f"HTTP {response.status_code}"
-            try:
-                error_detail = response.json().get("detail", "")
-                if error_detail:
-                    error_msg += f": {error_detail}"
-            except:
-                pass
+            error_msg = _error_message(response)
+            # Drain rather than just close, so the keep-alive connection is reused
+            discard_body(response)
             return response, error_msg
 
         return response, None
@@ -189,11 +455,7 @@ def make_request(method: str, url: str, **kwargs) -> tuple:
 
 def print_test_header(title: str):
     """Print a formatted test section header."""
-    print(f"\n{Colors.BOLD}{Colors.HEADER}")
-    print("=" * 70)
-    print(f"  {title}")
-    print("=" * 70)
-    print(f"{Colors.ENDC}")
+    sys.stdout.write(f"\n{HEADER_STYLE}\n{BANNER}\n  {title}\n{BANNER}\n{Colors.ENDC}\n")
 
 
 def print_summary(results: List[tuple]):
@@ -207,21 +469,24 @@ def print_summary(results: List[tuple]):
     passed = sum(1 for _, p in results if p)
     failed = total - passed
 
-    print(f"\n{Colors.BOLD}{Colors.HEADER}")
-    print("=" * 70)
-    print("  OVERALL TEST SUMMARY")
-    print("=" * 70)
-    print(f"{Colors.ENDC}")
-
-    print(f"\nTotal Tests:  {total}")
-    print(f"{Colors.OKGREEN}Passed:       {passed}{Colors.ENDC}")
-    print(f"{Colors.FAIL}Failed:       {failed}{Colors.ENDC}")
-    print(f"Success Rate: {(passed/total)*100:.1f}%\n")
-
-    # Print individual results
-    print(f"{Colors.BOLD}Individual Results:{Colors.ENDC}")
-    for name, result in results:
-        status = f"{Colors.OKGREEN}✓ PASS{Colors.ENDC}" if result else f"{Colors.FAIL}✗ FAIL{Colors.ENDC}"
-        print(f"  {name:40s} {status}")
-
-    print()
+    lines = [
+        f"\n{HEADER_STYLE}",
+        BANNER,
+        "  OVERALL TEST SUMMARY",
+        BANNER,
+        Colors.ENDC,
+
+        f"\nTotal Tests:  {total}",
+        f"{Colors.OKGREEN}Passed:       {passed}{Colors.ENDC}",
+        f"{Colors.FAIL}Failed:       {failed}{Colors.ENDC}",
+        f"Success Rate: {(passed/total)*100:.1f}%\n",
+
+        # Individual results
+        f"{Colors.BOLD}Individual Results:{Colors.ENDC}",
+    ]
+    lines.extend(
+        f"  {name:40s} {PASS_LABEL if result else FAIL_LABEL}" for name, result in results
+    )
+    lines.append("")
+
+    sys.stdout.write("\n".join(lines) + "\n")